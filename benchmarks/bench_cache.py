@@ -0,0 +1,53 @@
+"""Compare cold parsing of include tree with loading of binary cache.
+
+    ~$ python benchmarks/bench_cache.py --files 300 --options 50
+"""
+from argparse import ArgumentParser
+from os import path
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+from extendparser.include import Include
+
+
+def write_tree(tmp, files, options):
+    """Write main.ini which includes files with options and return its path.
+    """
+    main = path.join(tmp, "main.ini")
+    with open(main, "w", encoding="utf-8") as main_file:
+        for i in range(files):
+            filename = path.join(tmp, "include%d.ini" % i)
+            main_file.write(".include %s\n" % filename)
+            with open(filename, "w", encoding="utf-8") as file_:
+                file_.write("[section%d]\n" % i)
+                for j in range(options):
+                    file_.write("option%d = value %d\n" % (j, j))
+    return main
+
+
+def main():
+    """Run benchmark."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--options", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        main_file = write_tree(tmp, args.files, args.options)
+        cache_file = path.join(tmp, "cache.bin")
+        Include().read_cached(main_file, cache_file)
+
+        cold = min(repeat(lambda: Include().read(main_file),
+                          number=1, repeat=args.repeat))
+        cached = min(repeat(lambda: Include().read_cached(main_file,
+                                                          cache_file),
+                            number=1, repeat=args.repeat))
+
+    print("files: %d, options: %d" % (args.files, args.options))
+    print("cold parse: %.3f ms" % (cold * 1000))
+    print("cache load: %.3f ms (%.1fx)" % (cached * 1000, cold / cached))
+
+
+if __name__ == "__main__":
+    main()
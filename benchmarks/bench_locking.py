@@ -0,0 +1,106 @@
+"""Measure read throughput of locked parser with more reader threads.
+
+Readers call get_option in a loop while one writer thread reads the whole
+config again in regular intervals. Concurrent parser is compared with
+unlocked parser and with parser guarded by one mutex. Readers of unlocked
+parser could see half read config, such errors are counted:
+
+    ~$ PYTHONPATH=. python benchmarks/bench_locking.py --threads 1 2 4 8
+"""
+from argparse import ArgumentParser
+from threading import Thread, Event, Lock
+from time import perf_counter, sleep
+
+from extendparser import ExtendParser
+from extendparser.locking import Concurrent
+
+
+class Locked(Concurrent, ExtendParser):
+    """Parser with reader-writer lock."""
+
+
+class Mutex(ExtendParser):
+    """Parser guarded by one mutex."""
+
+    def __init__(self, *args, **kwargs):
+        self.mutex = Lock()
+        super().__init__(*args, **kwargs)
+
+    def get_option(self, *args, **kwargs):
+        with self.mutex:
+            return super().get_option(*args, **kwargs)
+
+    def read_string(self, *args, **kwargs):
+        with self.mutex:
+            return super().read_string(*args, **kwargs)
+
+
+def config_text(sections, options):
+    """Return text of config with sections x options."""
+    return "".join(
+        "[section%d]\n" % i + "".join("option%d = %d\n" % (j, j)
+                                      for j in range(options))
+        for i in range(sections))
+
+
+def run(factory, text, threads, duration, reload_interval):
+    """Return total count of reads per second and count of errors."""
+    parser = factory()
+    parser.read_string(text)
+    stop = Event()
+    counts = [0] * threads
+    errors = [0] * threads
+
+    def reader(index):
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                try:
+                    parser.get_option("section1", "option1", target=int)
+                except Exception:  # pylint: disable=broad-except
+                    errors[index] += 1
+            count += 100
+        counts[index] = count
+
+    def writer():
+        while not stop.wait(reload_interval):
+            parser.read_string(text)
+
+    workers = [Thread(target=reader, args=(i, )) for i in range(threads)]
+    workers.append(Thread(target=writer))
+    begin = perf_counter()
+    for worker in workers:
+        worker.start()
+    sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (perf_counter() - begin), sum(errors)
+
+
+def main():
+    """Run benchmark."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+",
+                        default=[1, 2, 4, 8])
+    parser.add_argument("--sections", type=int, default=50)
+    parser.add_argument("--options", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--reload", type=float, default=0.05,
+                        help="seconds between reloads in writer thread")
+    args = parser.parse_args()
+
+    text = config_text(args.sections, args.options)
+    factories = (("unlocked", ExtendParser), ("mutex", Mutex),
+                 ("rwlock", Locked))
+    print("%-8s" % "threads" + "".join("%14s %8s" % (name, "errors")
+                                       for name, _ in factories))
+    for threads in args.threads:
+        print("%-8d" % threads + "".join(
+            "%14.0f %8d" % run(factory, text, threads, args.duration,
+                               args.reload)
+            for _, factory in factories))
+
+
+if __name__ == "__main__":
+    main()
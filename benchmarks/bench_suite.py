@@ -0,0 +1,308 @@
+"""Benchmark read, include, get and environ hot paths against ConfigParser.
+
+Each case is measured for plain ConfigParser as baseline and for one or
+more extendparser variants. Throughput, latency percentiles and peak memory
+allocated by one call (tracemalloc) are reported. Results could be stored
+as JSON baseline and compared with later runs:
+
+    ~$ PYTHONPATH=. python benchmarks/bench_suite.py --save baseline.json
+    ~$ PYTHONPATH=. python benchmarks/bench_suite.py --compare baseline.json
+
+Comparison exits with status 1 when some variant is slower than baseline
+by more than threshold.
+"""
+import json
+import sys
+
+from argparse import ArgumentParser
+from configparser import ConfigParser
+from contextlib import contextmanager
+from itertools import cycle
+from os import environ, path
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter_ns
+from tracemalloc import start, stop, get_traced_memory, reset_peak, \
+    is_tracing
+
+from extendparser import ExtendParser
+from extendparser.environ import EnvironFirst
+from extendparser.get import Get, SectionSchema
+
+BASELINE = "configparser"
+
+
+def config_text(sections, options, prefix="section"):
+    """Return text of config with sections x options."""
+    lines = []
+    for i in range(sections):
+        lines.append("[%s%d]" % (prefix, i))
+        lines.extend("option%d = %d" % (j, j) for j in range(options))
+    return "\n".join(lines) + "\n"
+
+
+def write_include_tree(tmp, depth, fanout, options):
+    """Write tree of included files and return (main, flat_files).
+
+    Each file includes `fanout` files until `depth` is reached and has its
+    own section with `options` options. Flat files have the same sections
+    without .include lines in reading order, so plain ConfigParser could
+    read the same values.
+    """
+    flat = []
+
+    def write(name, level):
+        children = []
+        if level < depth:
+            children = [write("%s_%d" % (name, i), level + 1)
+                        for i in range(fanout)]
+        content = config_text(1, options, name + "_section")
+        filename = path.join(tmp, name + ".ini")
+        with open(filename, "w", encoding="utf-8") as file_:
+            for child in children:
+                file_.write(".include %s\n" % child)
+            file_.write(content)
+        flat.append(path.join(tmp, name + ".flat.ini"))
+        with open(flat[-1], "w", encoding="utf-8") as file_:
+            file_.write(content)
+        return filename
+
+    return write("main", 0), flat
+
+
+@contextmanager
+def environ_vars(variables, filler):
+    """Set variables and `filler` count of unrelated ones in environment."""
+    variables = dict(variables)
+    variables.update(("BENCH_FILLER_%d" % i, str(i)) for i in range(filler))
+    environ.update(variables)
+    try:
+        yield
+    finally:
+        for key in variables:
+            environ.pop(key, None)
+
+
+def measure(func, samples, inner):
+    """Return statistics of func calls.
+
+    Each of `samples` is time of `inner` calls, so timer overhead is not
+    significant for fast calls. Latencies are in microseconds.
+    """
+    func()      # warm up caches
+    times = []
+    for _ in range(samples):
+        begin = perf_counter_ns()
+        for _ in range(inner):
+            func()
+        times.append((perf_counter_ns() - begin) / inner / 1000)
+
+    tracing = is_tracing()
+    if not tracing:
+        start()
+    reset_peak()
+    before = get_traced_memory()[0]
+    func()
+    peak = get_traced_memory()[1] - before
+    if not tracing:
+        stop()
+
+    percentiles = quantiles(times, n=100, method="inclusive")
+    return {"ops": 1e6 / (sum(times) / len(times)),
+            "p50": percentiles[49],
+            "p95": percentiles[94],
+            "p99": percentiles[98],
+            "peak_kb": peak / 1024}
+
+
+def case_read(args):
+    """Parse string with sections x options."""
+    text = config_text(args.sections, args.options)
+
+    def read(factory):
+        return lambda: factory().read_string(text)
+    return {BASELINE: read(ConfigParser), "extendparser": read(ExtendParser)}
+
+
+def case_include(args):
+    """Read include tree with depth and fanout."""
+    tmp = args.tmp
+    main, flat = write_include_tree(tmp, args.depth, args.fanout,
+                                     args.options)
+
+    def stream():
+        parser = ExtendParser()
+        parser.include_stream = True
+        parser.read(main)
+
+    return {BASELINE: lambda: ConfigParser().read(flat),
+            "extendparser": lambda: ExtendParser().read(main),
+            "include_stream": stream}
+
+
+def keys(args):
+    """Return cycle of (section, option) keys."""
+    return cycle(("section%d" % i, "option%d" % j)
+                 for i in range(args.sections) for j in range(args.options))
+
+
+def case_get_option(args):
+    """Get option converted to int."""
+    text = config_text(args.sections, args.options)
+    plain = ConfigParser()
+    plain.read_string(text)
+    parser = Get()
+    parser.read_string(text)
+    cached = Get()
+    cached.cache_options = True
+    cached.read_string(text)
+    cached_keys = keys(args)
+    for _ in range(args.sections * args.options):     # fill the cache
+        cached.get_option(*next(cached_keys), target=int)
+    plain_keys, parser_keys = keys(args), keys(args)
+
+    return {BASELINE: lambda: plain.getint(*next(plain_keys)),
+            "get_option": lambda: parser.get_option(*next(parser_keys),
+                                                    target=int),
+            "cache_options": lambda: cached.get_option(*next(cached_keys),
+                                                       target=int)}
+
+
+def case_get_section(args):
+    """Get all options of section converted to int."""
+    text = config_text(args.sections, args.options)
+    plain = ConfigParser()
+    plain.read_string(text)
+    parser = Get()
+    parser.read_string(text)
+    options = tuple(("option%d" % j, int) for j in range(args.options))
+    schema = SectionSchema(options)
+    sections = ["section%d" % i for i in range(args.sections)]
+    plain_sections, parser_sections, schema_sections = \
+        cycle(sections), cycle(sections), cycle(sections)
+
+    def baseline():
+        section = plain[next(plain_sections)]
+        return {option: section.getint(option) for option, _ in options}
+
+    return {BASELINE: baseline,
+            "get_section": lambda: parser.get_section(next(parser_sections),
+                                                      options),
+            "section_schema": lambda: parser.get_section(
+                next(schema_sections), schema)}
+
+
+def case_environ(args):
+    """Get option, which is overridden from environment."""
+    text = config_text(args.sections, args.options)
+    plain = ConfigParser()
+    plain.read_string(text)
+    parser = EnvironFirst()
+    parser.read_string(text)
+    snapshot = EnvironFirst()
+    snapshot.environ_snapshot = True
+    snapshot.read_string(text)
+    plain_keys, parser_keys, snapshot_keys = keys(args), keys(args), \
+        keys(args)
+
+    return {BASELINE: lambda: plain.get(*next(plain_keys)),
+            "environ_first": lambda: parser.get(*next(parser_keys)),
+            "environ_snapshot": lambda: snapshot.get(*next(snapshot_keys))}
+
+
+CASES = (("read", case_read),
+         ("include", case_include),
+         ("get_option", case_get_option),
+         ("get_section", case_get_section),
+         ("environ", case_environ))
+
+
+def run(args):
+    """Run selected cases and return results."""
+    varname = EnvironFirst().varname
+    variables = {varname("section%d" % i, "option%d" % j): "env"
+                 for i in range(0, args.sections, 2)
+                 for j in range(args.options)}
+    results = {}
+    with TemporaryDirectory() as tmp, environ_vars(variables, args.environ):
+        args.tmp = tmp
+        for name, case in CASES:
+            if args.case and name not in args.case:
+                continue
+            inner = 1 if name in ("read", "include") else args.inner
+            results[name] = {
+                variant: measure(func, args.samples, inner)
+                for variant, func in case(args).items()}
+    return results
+
+
+def report(results, baseline=None, threshold=0.1):
+    """Print results and return list of regressions against baseline."""
+    regressions = []
+    row = "%-12s %-17s %12s %10s %10s %10s %10s %8s"
+    print(row % ("case", "variant", "ops/s", "p50 us", "p95 us", "p99 us",
+                 "peak kB", "change"))
+    for name, variants in results.items():
+        base_ops = variants[BASELINE]["ops"]
+        for variant, stats in variants.items():
+            change = "%.2fx" % (stats["ops"] / base_ops)
+            if baseline and variant in baseline.get(name, {}):
+                old = baseline[name][variant]["ops"]
+                change = "%+.0f%%" % ((stats["ops"] / old - 1) * 100)
+                if variant != BASELINE and \
+                        stats["ops"] < old * (1 - threshold):
+                    regressions.append((name, variant))
+            print(row % (name, variant, "%.0f" % stats["ops"],
+                         "%.2f" % stats["p50"], "%.2f" % stats["p95"],
+                         "%.2f" % stats["p99"], "%.1f" % stats["peak_kb"],
+                         change))
+    return regressions
+
+
+def main():
+    """Run benchmark suite."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--case", action="append",
+                        choices=[name for name, _ in CASES],
+                        help="run only this case, could be repeated")
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--options", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=3,
+                        help="depth of include tree")
+    parser.add_argument("--fanout", type=int, default=4,
+                        help="included files in each file")
+    parser.add_argument("--environ", type=int, default=1000,
+                        help="count of unrelated environment variables")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--inner", type=int, default=1000,
+                        help="calls in one sample for get cases")
+    parser.add_argument("--save", metavar="FILE",
+                        help="store results as JSON baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare results with JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown against baseline")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file_:
+            baseline = json.load(file_)["results"]
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file_:
+            json.dump({"python": sys.version,
+                       "args": {key: getattr(args, key) for key in (
+                           "sections", "options", "depth", "fanout",
+                           "environ", "samples", "inner")},
+                       "results": results}, file_, indent=2)
+    if regressions:
+        print("regressions: " + ", ".join(
+            "%s/%s" % regression for regression in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ example code:
 
 from .get import Get
 from .include import Include
+from .frozen import FrozenParser
 
 __author__ = "Ondřej Tůma"
 __version__ = "0.3.0-dev"
@@ -18,9 +19,21 @@ __copyright__ = "Copyright 2018"
 __license__ = "BSD"
 __email__ = "mcbig@zeropage.cz"
 
-__all__ = ["include", "get", "environ", "ExtendParser"]
+__all__ = ["include", "get", "environ", "frozen", "interpolation", "watch",
+           "diff", "lazy", "shared", "convert", "stats", "locking",
+           "writeback", "layers", "ExtendParser"]
 
 
 # pylint: disable=too-many-ancestors
 class ExtendParser(Get, Include):
     """Final class with all extends"""
+
+    def freeze(self):
+        """Return FrozenParser, read-only view with interpolated values."""
+        return FrozenParser(self)
+
+    def stats(self):
+        """Return snapshot of instrument counters or None if disabled."""
+        if self.instrument is None:
+            return None
+        return self.instrument.snapshot()
@@ -0,0 +1,253 @@
+"""Registry of converters used by get_option and get_section methods.
+
+Converter for each (target, delimiter) pair is compiled only once, so
+get_option does not check target type on each call. Besides bool and
+sequences, there are converters for dict, datetime, date, time and
+timedelta, and for IntArray and FloatArray numeric arrays. Other targets
+are called with stripped value, so Decimal, ipaddress.ip_network or
+ByteSize from this module could be used too.
+
+    example code:
+
+        >>> from datetime import timedelta
+        >>> from extendparser.get import Get
+        >>> from extendparser.convert import ByteSize
+        >>> cp = Get()
+        >>> cp.read_string('''
+        ... [cache]
+        ... size = 10MiB
+        ... timeout = 1m30s
+        ... limits = read=10, write=5
+        ... ''')
+        >>> cp.get_option("cache", "size", target=ByteSize)
+        10485760
+        >>> cp.get_option("cache", "timeout", target=timedelta)
+        datetime.timedelta(seconds=90)
+        >>> cp.get_option("cache", "limits", target=dict)
+        {'read': '10', 'write': '5'}
+
+    Own converter:
+
+        >>> from extendparser.convert import register
+        >>> class Upper(str):
+        ...     pass
+        >>> @register(Upper)
+        ... def upper(delimiter):
+        ...     return lambda parser, value: Upper(value.strip().upper())
+        >>> cp.get_option("cache", "size", target=Upper)
+        '10MIB'
+"""
+import re
+
+from array import array
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+
+__all__ = ["ByteSize", "NumberArray", "IntArray", "FloatArray",
+           "compile_target", "parse_duration", "register"]
+
+CONVERTERS = {}     # target: factory(delimiter) returns convert function
+_COMPILED = {}      # (type or registered target, delimiter): function
+
+RE_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgtp]?)(i?)b?\s*$", re.I)
+RE_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|us|d|h|m|s|w)", re.I)
+DURATION_UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1,
+                  "ms": 0.001, "us": 0.000001}
+
+
+def register(target, factory=None):
+    """Register factory(delimiter) which returns convert(parser, value).
+
+    It could be used as decorator."""
+    def decorator(factory):
+        CONVERTERS[target] = factory
+        _COMPILED.clear()
+        return factory
+
+    if factory is None:
+        return decorator
+    return decorator(factory)
+
+
+def compile_target(target, delimiter=','):
+    """Return function, which converts string value to target type.
+
+    Returned function is called with parser and value arguments. Functions
+    are remembered only for types and registered targets, so other callables
+    like lambda functions are compiled on each call."""
+    key = (target, delimiter)
+    if key in _COMPILED:
+        return _COMPILED[key]
+
+    factory = CONVERTERS.get(target)
+    if factory is None and isinstance(target, type) \
+            and issubclass(target, bool):
+        factory = CONVERTERS[bool]
+    if factory is None:
+        def convert(parser, value):     # pylint: disable=unused-argument
+            return target(value.strip())
+    else:
+        convert = factory(delimiter)
+    if isinstance(target, type) or target in CONVERTERS:
+        _COMPILED[key] = convert
+    return convert
+
+
+class ByteSize(int):
+    """Integer size in bytes, which could be parsed from string.
+
+    Units k, M, G, T and P are powers of 1000, units with i (KiB, MiB...)
+    are powers of 1024. Size is computed exactly, and fractional count of
+    bytes is ValueError.
+
+        >>> from extendparser.convert import ByteSize
+        >>> ByteSize("1.5 kB"), ByteSize("2MiB"), ByteSize(512)
+        (1500, 2097152, 512)
+    """
+
+    def __new__(cls, value=0):
+        size = value
+        if isinstance(value, str):
+            match = RE_SIZE.match(value)
+            if match is None:
+                raise ValueError("Invalid size: %r" % value)
+            number, unit, binary = match.groups()
+            power = "kmgtp".find(unit.lower()) + 1 if unit else 0
+            size = Decimal(number) * (1024 if binary else 1000) ** power
+        if isinstance(size, (float, Decimal)):
+            if size % 1:
+                raise ValueError("Fractional size: %r" % value)
+            size = int(size)
+        return super().__new__(cls, size)
+
+
+class NumberArray(array):
+    """Compact array of numbers, which could be parsed from string.
+
+    TYPECODE class attribute is array typecode. Arrays of integers support
+    inclusive ranges like 8000-8010, and reversed range raises ValueError.
+    Own subclasses could be registered by
+    register(NewArray, NumberArray.factory).
+
+        >>> from extendparser.convert import IntArray
+        >>> IntArray("1, 5-7, -3")
+        IntArray('q', [1, 5, 6, 7, -3])
+    """
+    TYPECODE = 'd'
+
+    def __new__(cls, value=(), delimiter=','):
+        if not isinstance(value, str):
+            return super().__new__(cls, cls.TYPECODE, value)
+        result = super().__new__(cls, cls.TYPECODE)
+        if cls.TYPECODE in 'fd':
+            result.extend(float(item) for item in value.split(delimiter)
+                          if item.strip())
+            return result
+
+        for item in value.split(delimiter):
+            item = item.strip()
+            index = item.find('-', 1)
+            if index > 0:
+                first, last = int(item[:index]), int(item[index+1:])
+                if last < first:
+                    raise ValueError("Invalid range: %r" % item)
+                result.extend(range(first, last + 1))
+            elif item:
+                result.append(int(item))
+        return result
+
+    @classmethod
+    def factory(cls, delimiter):
+        """Converter factory for registry."""
+        def convert(parser, value):     # pylint: disable=unused-argument
+            return cls(value, delimiter)
+        return convert
+
+
+class IntArray(NumberArray):
+    """Array of 64-bit signed integers."""
+    TYPECODE = 'q'
+
+
+class FloatArray(NumberArray):
+    """Array of double floats."""
+    TYPECODE = 'd'
+
+
+def parse_duration(value):
+    """Return timedelta from string like 1h30m, 500ms or number of seconds.
+
+        >>> from extendparser.convert import parse_duration
+        >>> parse_duration("1d 2h"), parse_duration("2.5")
+        (datetime.timedelta(days=1, seconds=7200), \
+datetime.timedelta(seconds=2, microseconds=500000))
+    """
+    value = value.strip()
+    try:
+        return timedelta(seconds=float(value))
+    except ValueError:
+        pass
+    matches = RE_DURATION.findall(value)
+    if not matches or RE_DURATION.sub("", value).strip():
+        raise ValueError("Invalid duration: %r" % value)
+    return timedelta(seconds=sum(float(number) * DURATION_UNITS[unit.lower()]
+                                 for number, unit in matches))
+
+
+# pylint: disable=unused-argument
+# pylint: disable=protected-access
+
+@register(bool)
+def _boolean(delimiter):
+    def convert(parser, value):
+        return parser._convert_to_boolean(value)
+    return convert
+
+
+def _sequence(target):
+    def factory(delimiter):
+        def convert(parser, value):
+            value = value.strip()
+            if not value:
+                return target()
+            return target(s.strip() for s in value.split(delimiter))
+        return convert
+    return factory
+
+
+for _target in (list, tuple, set):
+    register(_target, _sequence(_target))
+
+
+@register(dict)
+def _dict(delimiter):
+    def convert(parser, value):
+        value = value.strip()
+        if not value:
+            return {}
+        items = (item.partition('=') for item in value.split(delimiter))
+        return {key.strip(): val.strip() for key, _, val in items}
+    return convert
+
+
+def _isoformat(target):
+    def factory(delimiter):
+        def convert(parser, value):
+            return target.fromisoformat(value.strip())
+        return convert
+    return factory
+
+
+for _target in (datetime, date, time):
+    register(_target, _isoformat(_target))
+
+
+for _target in (IntArray, FloatArray):
+    register(_target, _target.factory)
+
+
+@register(timedelta)
+def _timedelta(delimiter):
+    def convert(parser, value):
+        return parse_duration(value)
+    return convert
@@ -0,0 +1,161 @@
+"""Differences between two parsers and notification about them.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.diff import diff
+        >>> old, new = ExtendParser(), ExtendParser()
+        >>> old.read_string("[db]\\nhost = localhost\\nport = 5432")
+        >>> new.read_string("[db]\\nhost = example.net\\nport = 5432")
+        >>> delta = diff(old, new)
+        >>> delta.changed
+        {('db', 'host'): ('localhost', 'example.net')}
+"""
+from logging import getLogger
+
+__all__ = ["ConfigDiff", "ChangeNotifier", "diff"]
+
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+
+class ConfigDiff():
+    """Differences between two parsers.
+
+    Options are stored by (section, option) key. Attributes are:
+
+        added_sections   - set of new sections
+        removed_sections - set of removed sections
+        added            - dictionary of new options and their values
+        removed          - dictionary of removed options and their values
+        changed          - dictionary of options and (old, new) values
+        sources          - dictionary of options and sources of their used
+                           definitions from Include.option_sources, if
+                           they are known
+    """
+    __slots__ = ("added_sections", "removed_sections", "added", "removed",
+                 "changed", "sources")
+
+    def __init__(self, added_sections=None, removed_sections=None,
+                 added=None, removed=None, changed=None, sources=None):
+        # pylint: disable=too-many-arguments
+        self.added_sections = added_sections or set()
+        self.removed_sections = removed_sections or set()
+        self.added = added or {}
+        self.removed = removed or {}
+        self.changed = changed or {}
+        self.sources = sources or {}
+
+    def __bool__(self):
+        return bool(self.added_sections or self.removed_sections
+                    or self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return "<ConfigDiff added=%r removed=%r changed=%r>" % (
+            self.added, self.removed, self.changed)
+
+    def keys(self):
+        """Return set of all changed (section, option) keys."""
+        return self.added.keys() | self.removed.keys() | self.changed.keys()
+
+    def filter(self, section=None, option=None):
+        """Return ConfigDiff only with section or option."""
+        def match(key):
+            return (section is None or key[0] == section) \
+                and (option is None or key[1] == option)
+
+        def sections(items):
+            if option is not None:
+                return set()
+            return {item for item in items
+                    if section is None or item == section}
+
+        return ConfigDiff(
+            sections(self.added_sections), sections(self.removed_sections),
+            {key: val for key, val in self.added.items() if match(key)},
+            {key: val for key, val in self.removed.items() if match(key)},
+            {key: val for key, val in self.changed.items() if match(key)},
+            {key: val for key, val in self.sources.items() if match(key)})
+
+
+def _sections(parser):
+    # pylint: disable=protected-access
+    return {**parser._sections, parser.default_section: parser._defaults}
+
+
+def diff(old, new, sections=None):
+    """Return ConfigDiff of raw values between old and new parser.
+
+    Sections with equal options are skipped without comparing each option.
+    If sections are set, only these sections are compared.
+    """
+    old_sections = _sections(old)
+    new_sections = _sections(new)
+    if sections is None:
+        sections = old_sections.keys() | new_sections.keys()
+    old_sources = getattr(old, "option_sources", None) or {}
+    new_sources = getattr(new, "option_sources", None) or {}
+
+    delta = ConfigDiff()
+    for section in sections:
+        old_options = old_sections.get(section)
+        new_options = new_sections.get(section)
+        if old_options == new_options:
+            continue
+        if old_options is None:
+            delta.added_sections.add(section)
+            old_options = {}
+        if new_options is None:
+            delta.removed_sections.add(section)
+            new_options = {}
+        for option in old_options.keys() | new_options.keys():
+            key = (section, option)
+            if option not in new_options:
+                delta.removed[key] = old_options[option]
+                source = old_sources.get(key, [None])[-1]
+            elif option not in old_options:
+                delta.added[key] = new_options[option]
+                source = new_sources.get(key, [None])[-1]
+            elif old_options[option] != new_options[option]:
+                delta.changed[key] = (old_options[option],
+                                      new_options[option])
+                source = new_sources.get(key, [None])[-1]
+            else:
+                continue
+            if source is not None:
+                delta.sources[key] = source
+    return delta
+
+
+class ChangeNotifier():
+    """Callbacks registered for sections or options changes.
+
+        >>> from extendparser.diff import ChangeNotifier, ConfigDiff
+        >>> notifier = ChangeNotifier()
+        >>> notifier.subscribe(print, "db", "host")
+        >>> notifier.notify(ConfigDiff(changed={
+        ...     ("db", "host"): ("localhost", "example.net"),
+        ...     ("db", "port"): ("5432", "5433")}))
+        <ConfigDiff added={} removed={} changed={('db', 'host'): \
+('localhost', 'example.net')}>
+    """
+
+    def __init__(self):
+        self._callbacks = []
+
+    def subscribe(self, callback, section=None, option=None):
+        """Add callback(delta) called when section or option is changed."""
+        self._callbacks.append((callback, section, option))
+
+    def unsubscribe(self, callback, section=None, option=None):
+        """Remove callback."""
+        self._callbacks.remove((callback, section, option))
+
+    def notify(self, delta):
+        """Call callbacks with part of delta, which they subscribed."""
+        for callback, section, option in tuple(self._callbacks):
+            if section is None and option is None:
+                part = delta
+            else:
+                part = delta.filter(section, option)
+            if part:
+                callback(part)
@@ -67,7 +67,68 @@ class VarNameBuilder():  # pylint: disable=too-few-public-methods
                                       option=option.upper())
 
 
-class EnvironFirst(VarNameBuilder, ConfigParser):
+class EnvironOverlay(VarNameBuilder):
+    """Support class for looking up variables in environment.
+
+    When `environ_snapshot` is true, environment is copied at first lookup
+    and each option is mapped to its variable only once. Environment changes
+    are not visible until refresh_environ method is called:
+
+        >>> from os import environ
+        >>> from extendparser.environ import EnvironOverlay
+        >>> env = EnvironOverlay()
+        >>> env.environ_snapshot = True
+        >>> environ["DATABASE_PORT"] = "5432"
+        >>> env.environ_lookup('database', 'port')
+        ('DATABASE_PORT', '5432')
+        >>> environ["DATABASE_PORT"] = "5433"
+        >>> env.environ_lookup('database', 'port')
+        ('DATABASE_PORT', '5432')
+        >>> env.refresh_environ()
+        >>> env.environ_lookup('database', 'port')
+        ('DATABASE_PORT', '5433')
+        >>> del environ["DATABASE_PORT"]
+
+    When `instrument` is set to extendparser.stats.Instrument, values
+    resolved from environment are counted.
+    """
+    environ_snapshot = False
+    instrument = None
+    _environ_overlay = None
+    _environ = None
+
+    def refresh_environ(self):
+        """Drop environment snapshot and cached values.
+
+        Snapshot is created again at next lookup."""
+        self._environ_overlay = None
+        clear_cache = getattr(self, "clear_cache", None)
+        if clear_cache is not None:
+            clear_cache()
+
+    def environ_lookup(self, section, option):
+        """Return tuple of variable name and its value or None."""
+        if not self.environ_snapshot:
+            key = self.varname(section, option)
+            log.debug('Try to use %s environment variable', key)
+            return key, environ.get(key)
+
+        overlay = self._environ_overlay
+        if overlay is None:
+            # overlay is published last, so other threads never see it
+            # without environment copy
+            self._environ = dict(environ)
+            overlay = self._environ_overlay = {}
+        try:
+            return overlay[(section, option)]
+        except KeyError:
+            key = self.varname(section, option)
+            log.debug('Try to use %s environment variable', key)
+            item = overlay[(section, option)] = (key, self._environ.get(key))
+            return item
+
+
+class EnvironFirst(EnvironOverlay, ConfigParser):
     """Read values from system environment first, then from ConfigParser.
 
         >>> from os import environ
@@ -95,15 +156,16 @@ class EnvironFirst(VarNameBuilder, ConfigParser):
         if raw:
             return super().get(section, option, *args, raw=raw, **kwargs)
 
-        key = self.varname(section, option)
-        log.debug('Try to use %s environment variable', key)
-        if key in environ:
-            return environ[key]
+        value = self.environ_lookup(section, option)[1]
+        if value is not None:
+            if self.instrument is not None:
+                self.instrument.environ_hit(section, option)
+            return value
 
         return super().get(section, option, *args, raw=raw, **kwargs)
 
 
-class EnvironLast(VarNameBuilder, ConfigParser):
+class EnvironLast(EnvironOverlay, ConfigParser):
     """Read values from system environment as fallback for ConfigParser.
 
         >>> from os import environ
@@ -124,9 +186,12 @@ class EnvironLast(VarNameBuilder, ConfigParser):
     def get(self, section, option, *args, **kwargs):
         """If variable exist in environment, use it's value as fallback."""
         # pylint: disable=arguments-differ
-        key = self.varname(section, option)
-        if key in environ:
+        key, value = self.environ_lookup(section, option)
+        if value is not None:
             log.info('Use %s environment variable as fallback', key)
-            kwargs['fallback'] = environ[key]
+            kwargs['fallback'] = value
+            if self.instrument is not None and \
+                    not self.has_option(section, option):
+                self.instrument.environ_hit(section, option)
 
         return super().get(section, option, *args, **kwargs)
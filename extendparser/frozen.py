@@ -0,0 +1,179 @@
+"""Read-only parser with values resolved in advance.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> cp = ExtendParser()
+        >>> cp.read_string('''
+        ... [main]
+        ... port = 80
+        ... url = http://localhost:%(port)s/
+        ... ''')
+        >>> frozen = cp.freeze()
+        >>> print(frozen.get("main", "url"))
+        http://localhost:80/
+        >>> frozen.getint("main", "port")
+        80
+        >>> frozen.get_option("main", "timeout", target=float, fallback=1.0)
+        1.0
+"""
+from abc import ABC, abstractmethod
+from logging import getLogger
+from configparser import ConfigParser, RawConfigParser, NoSectionError, \
+    NoOptionError, DEFAULTSECT
+
+from .get import Nothing, SectionSchema, compile_target
+
+__all__ = ["ReadOnlyParser", "FrozenParser"]
+
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+
+def _optionxform(parser):
+    """Return optionxform of parser, which does not hold parser if possible.
+
+    Only optionxform method defined by parser class must be bound to it."""
+    xform = vars(parser).get("optionxform")
+    if xform is not None:
+        return xform
+    if type(parser).optionxform is RawConfigParser.optionxform:
+        return str.lower
+    return parser.optionxform
+
+
+class ReadOnlyParser(ABC):
+    """Base class of read-only parsers with get methods like Get class.
+
+    Child class must define _lookup method, which returns value or raises
+    NoSectionError or NoOptionError.
+    """
+    __slots__ = ("_optionxform", "_booleans", "default_section")
+
+    def __init__(self, optionxform=str.lower, booleans=None,
+                 default_section=DEFAULTSECT):
+        self._optionxform = optionxform
+        self._booleans = dict(ConfigParser.BOOLEAN_STATES
+                              if booleans is None else booleans)
+        self.default_section = default_section
+
+    @abstractmethod
+    def _lookup(self, section, option):
+        """Return value of transformed option in section."""
+
+    def get(self, section, option, *, fallback=Nothing):
+        """Get an option value for a given section."""
+        try:
+            return self._lookup(section, self._optionxform(option))
+        except (NoSectionError, NoOptionError):
+            if fallback is Nothing:
+                raise
+            return fallback
+
+    def _get_conv(self, section, option, conv, fallback):
+        try:
+            return conv(self.get(section, option))
+        except (NoSectionError, NoOptionError):
+            if fallback is Nothing:
+                raise
+            return fallback
+
+    def getint(self, section, option, *, fallback=Nothing):
+        """Get an option value as int."""
+        return self._get_conv(section, option, int, fallback)
+
+    def getfloat(self, section, option, *, fallback=Nothing):
+        """Get an option value as float."""
+        return self._get_conv(section, option, float, fallback)
+
+    def getboolean(self, section, option, *, fallback=Nothing):
+        """Get an option value as boolean."""
+        return self._get_conv(section, option, self._convert_to_boolean,
+                              fallback)
+
+    def _convert_to_boolean(self, value):
+        if value.lower() not in self._booleans:
+            raise ValueError('Not a boolean: %s' % value)
+        return self._booleans[value.lower()]
+
+    def get_option(self, section, option, target=str, fallback=Nothing,
+                   delimiter=','):
+        """Return option in target type like Get.get_option."""
+        return self._get_option(section, option,
+                                compile_target(target, delimiter), fallback,
+                                (section, option, target, delimiter))
+
+    def _get_option(self, section, option, convert, fallback, key):
+        # pylint: disable=unused-argument
+        try:
+            return convert(self, self.get(section, option))
+        except (NoSectionError, NoOptionError):
+            if fallback is Nothing:
+                log.warning("[%s]::%s not defined and no fallback value "
+                            "specified", section, option)
+                raise
+            log.info("Using fallback value `%s' for [%s]::%s",
+                     fallback, section, option)
+            return fallback
+
+    def get_section(self, section, options, skip=True):
+        """Get full options from section like Get.get_section."""
+        if not isinstance(options, SectionSchema):
+            options = SectionSchema(options)
+        return options.extract(self, section, skip)
+
+
+class FrozenParser(ReadOnlyParser):
+    """Immutable view of parser with all values interpolated.
+
+    Values are read by parser get method when FrozenParser is created, so
+    reading does not run interpolation and instance could be shared between
+    threads without locking.
+    """
+    __slots__ = ("_sections", "_defaults")
+
+    def __init__(self, parser):
+        super().__init__(_optionxform(parser), parser.BOOLEAN_STATES,
+                         parser.default_section)
+        self._defaults = {
+            option: parser.get(parser.default_section, option)
+            for option in parser.defaults()}
+        self._sections = {
+            section: {option: parser.get(section, option)
+                      for option in parser.options(section)}
+            for section in parser.sections()}
+
+    def _section(self, section):
+        if section in self._sections:
+            return self._sections[section]
+        if section == self.default_section:
+            return self._defaults
+        raise NoSectionError(section)
+
+    def sections(self):
+        """Return list of section names, excluding default section."""
+        return list(self._sections)
+
+    def has_section(self, section):
+        """Indicate whether the named section is present."""
+        return section in self._sections
+
+    def options(self, section):
+        """Return list of option names for section with defaults."""
+        return list(self._section(section))
+
+    def has_option(self, section, option):
+        """Check for the existence of option in section."""
+        try:
+            return self._optionxform(option) in self._section(section)
+        except NoSectionError:
+            return False
+
+    def items(self, section):
+        """Return list of (name, value) tuples for section."""
+        return list(self._section(section).items())
+
+    def _lookup(self, section, option):
+        options = self._section(section)
+        if option not in options:
+            raise NoOptionError(option, section)
+        return options[option]
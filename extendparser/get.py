@@ -17,16 +17,35 @@
         ...                                  ("string", str, "value")))
         >>> kwargs == {'tuple': ('a', 'b', 'c'), 'string': 'value'}
         True
+
+    Options for get_section could be compiled to SectionSchema once:
+
+        >>> from collections import namedtuple
+        >>> from extendparser.get import SectionSchema
+        >>> Test = namedtuple("Test", ("tuple", "string"))
+        >>> schema = SectionSchema((("tuple", tuple, tuple(), ':'),
+        ...                         ("string", str, "value")), Test)
+        >>> cp.get_section("test", schema)
+        Test(tuple=('a', 'b', 'c'), string='value')
 """
 
+from collections import Counter
 from logging import getLogger
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
 from configparser import ConfigParser, NoSectionError, NoOptionError
 
-__all__ = ["Get", "Nothing"]
+from .convert import compile_target
+from .interpolation import CachedInterpolation
+
+__all__ = ["Get", "Nothing", "SectionSchema", "FallbackLog",
+           "compile_target"]
 
 # pylint: disable=too-many-ancestors
 # pylint: disable=too-few-public-methods
 # pylint: disable=too-many-arguments
+# pylint: disable=protected-access
 
 log = getLogger(__package__)  # pylint: disable=invalid-name
 
@@ -35,34 +54,278 @@ class Nothing:
     """Class using for get_option default parameter."""
 
 
+class SectionSchema():
+    """Compiled options for get_section method.
+
+    Params:
+        options - list of tuples (option, target, fallback, delimiter)
+                  like for get_section method.
+        factory - if is set, it is called with values as keyword arguments,
+                  so it could be namedtuple or class with __slots__.
+
+    Skipped options are not passed to factory, so they must have default
+    values in factory. If factory could not be called without them,
+    NoSectionError or NoOptionError of the first skipped option is raised.
+    """
+    __slots__ = ("options", "factory")
+
+    def __init__(self, options, factory=None):
+        compiled = []
+        for args in options:
+            if not isinstance(args, (list, tuple)):
+                args = (args,)
+            args = tuple(args) + (str, Nothing, ',')[len(args) - 1:]
+            option, target, fallback, delimiter = args
+            compiled.append((option, compile_target(target, delimiter),
+                             fallback, (option, target, delimiter)))
+        self.options = tuple(compiled)
+        self.factory = factory
+
+    def extract(self, parser, section, skip=True):
+        """Return values of section options from parser."""
+        values = {}
+        missing = None
+        for option, convert, fallback, key in self.options:
+            try:
+                values[option] = parser._get_option(
+                    section, option, convert, fallback, (section, ) + key)
+            except (NoSectionError, NoOptionError) as err:
+                if not skip:
+                    raise
+                if missing is None:
+                    missing = err
+        return self.create(values, missing)
+
+    def create(self, values, missing=None):
+        """Return values, or factory result if factory is set.
+
+        Missing is error of first skipped option. It is raised instead of
+        TypeError, when factory needs skipped option."""
+        if self.factory is None:
+            return values
+        if missing is None:
+            return self.factory(**values)
+        try:
+            return self.factory(**values)
+        except TypeError:
+            raise missing from None
+
+
+class FallbackLog():
+    """Aggregated log of fallback values and missing options.
+
+    Each key is logged only at first time, next events are only counted.
+    Counts are logged by report method, which is called automatically when
+    `interval` seconds passed from last report.
+
+        >>> from extendparser.get import Get, FallbackLog
+        >>> cp = Get()
+        >>> cp.fallback_log = FallbackLog()
+        >>> for i in range(3):
+        ...     cp.get_option("test", "number", target=int, fallback=1)
+        1
+        1
+        1
+        >>> cp.fallback_log.summary()
+        {('fallback', 'test', 'number'): 3}
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self._counts = Counter()    # events from last report
+        self._totals = Counter()
+        self._lock = Lock()
+        self._reported = monotonic()
+
+    def _event(self, kind, section, option):
+        key = (kind, section, option)
+        with self._lock:
+            first = key not in self._totals
+            self._totals[key] += 1
+            self._counts[key] += 1
+        return first
+
+    def _tick(self):
+        if self.interval is not None and \
+                monotonic() - self._reported >= self.interval:
+            self.report()
+
+    def fallback(self, section, option, value):
+        """Record using of fallback value."""
+        if self._event("fallback", section, option):
+            log.info("Using fallback value `%s' for [%s]::%s, next usage "
+                     "will be only counted", value, section, option)
+        self._tick()
+
+    def missing(self, section, option):
+        """Record missing option without fallback value."""
+        if self._event("missing", section, option):
+            log.warning("[%s]::%s not defined and no fallback value "
+                        "specified, next errors will be only counted",
+                        section, option)
+        self._tick()
+
+    def summary(self):
+        """Return dictionary of counts by (kind, section, option)."""
+        with self._lock:
+            return dict(self._totals)
+
+    def report(self):
+        """Log counts of events from last report."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._reported = monotonic()
+        for (kind, section, option), count in sorted(counts.items()):
+            if kind == "missing":
+                log.warning("[%s]::%s was missing %d times",
+                            section, option, count)
+            else:
+                log.info("Fallback value for [%s]::%s was used %d times",
+                         section, option, count)
+
+    def clear(self):
+        """Drop all counts, so each key is logged again."""
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+
+
 class Get(ConfigParser):
-    """Extends ConfigParser for smarter get methods."""
+    """Extends ConfigParser for smarter get methods.
+
+    When `cache_options` is true, converted values from `get_option` are
+    cached and the cache is cleared each time the parser is changed. Cached
+    values are shared, so returned lists and sets must not be modified.
+    Cache of CachedInterpolation is kept up to date too.
+
+        >>> from extendparser.get import Get
+        >>> cp = Get()
+        >>> cp.cache_options = True
+        >>> cp.read_string("[test]\\nnumber = 42")
+        >>> cp.get_option("test", "number", target=int)
+        42
+        >>> cp.get_option("test", "number", target=int)
+        42
+        >>> cp.cache_hits, cp.cache_misses
+        (1, 1)
+        >>> cp.set("test", "number", "7")
+        >>> cp.get_option("test", "number", target=int)
+        7
+
+    When `instrument` is set to extendparser.stats.Instrument, lookups,
+    fallbacks and missing options from `get_option` are counted.
+
+    When `fallback_log` is set to FallbackLog, fallback values and missing
+    options are logged once per key and counted instead of logging each
+    call.
+    """
+    cache_options = False
+    instrument = None
+    fallback_log = None
+
+    def __init__(self, *args, **kwargs):
+        # ConfigParser constructor could call read_dict with defaults
+        self._option_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        super().__init__(*args, **kwargs)
+
+    def clear_cache(self):
+        """Clear cached values from get_option and CachedInterpolation."""
+        self._option_cache.clear()
+        if isinstance(self._interpolation, CachedInterpolation):
+            self._interpolation.clear()
+
+    def _option_changed(self, section, option):
+        self._option_cache.clear()
+        if isinstance(self._interpolation, CachedInterpolation):
+            self._interpolation.invalidate(section or self.default_section,
+                                           self.optionxform(option))
+
+    # caches are invalidated after change, so other thread could not store
+    # old value to them while parser is being changed
+    def _read(self, fp, fpname):
+        try:
+            super()._read(fp, fpname)
+        finally:
+            self.clear_cache()
+
+    def read_dict(self, dictionary, source='<dict>'):
+        try:
+            super().read_dict(dictionary, source)
+        finally:
+            self.clear_cache()
+
+    def set(self, section, option, value=None):
+        try:
+            super().set(section, option, value)
+        finally:
+            self._option_changed(section, option)
+
+    def remove_option(self, section, option):
+        try:
+            return super().remove_option(section, option)
+        finally:
+            self._option_changed(section, option)
+
+    def remove_section(self, section):
+        try:
+            return super().remove_section(section)
+        finally:
+            self.clear_cache()
 
     def get_option(self, section, option, target=str, fallback=Nothing,
                    delimiter=','):
         """Return option in target type.
 
         It can parse string to tuple, list or set. Extends classes from tuple,
-        list or set must have own string parser in constructor.
+        list or set must have own string parser in constructor. Other
+        targets could be registered by extendparser.convert.register.
         """
+        return self._get_option(section, option,
+                                compile_target(target, delimiter), fallback,
+                                (section, option, target, delimiter))
+
+    def _get_option(self, section, option, convert, fallback, key):
+        """Return option converted by compiled convert function."""
+        instrument = self.instrument
+        if instrument is not None:
+            instrument.lookup(section, option)
+        if self.cache_options:
+            if key in self._option_cache:
+                self.cache_hits += 1
+                return self._option_cache[key]
+            self.cache_misses += 1
+
         try:
-            if issubclass(target, bool):
-                return self.getboolean(section, option)
-
-            value = self.get(section, option).strip()
-            if target in (list, tuple, set):
-                if not value:
-                    return target()
-                return target(s.strip() for s in value.split(delimiter))
-            return target(value)
-        except (NoSectionError, NoOptionError):
-            if fallback is Nothing:
+            value = convert(self, self.get(section, option))
+        except (NoSectionError, NoOptionError) as err:
+            return self._fallback(section, option, fallback, err)
+
+        if self.cache_options:
+            self._option_cache[key] = value
+        return value
+
+    def _fallback(self, section, option, fallback, err):
+        """Return fallback value, or raise err if there is no fallback."""
+        instrument = self.instrument
+        if fallback is Nothing:
+            if self.fallback_log is not None:
+                self.fallback_log.missing(section, option)
+            else:
                 log.warning("[%s]::%s not defined and no fallback value "
                             "specified", section, option)
-                raise
+            if instrument is not None:
+                instrument.missed(section, option)
+            raise err
+        if self.fallback_log is not None:
+            self.fallback_log.fallback(section, option, fallback)
+        else:
             log.info("Using fallback value `%s' for [%s]::%s",
                      fallback, section, option)
-            return fallback
+        if instrument is not None:
+            instrument.fallback(section, option)
+        return fallback
 
     def get_section(self, section, options, skip=True):
         """Get full options from section.
@@ -72,21 +335,97 @@ class Get(ConfigParser):
             options - list of tuples as *args fo get method
                       (option, target, fallback, delimiter) so only
                       option is required. That could be set as string item
-                      in options list.
+                      in options list. It could be SectionSchema too.
             skip    - if is true, non exist options are skiped, so
                       no error is rised.
 
         Return dictionary, which could be use as **kwargs. If skip is set to
         true, options without fallback values are not return if is not found
-        in config.
+        in config. If options is SectionSchema with factory, factory result
+        is returned.
         """
-        values = {}
-        for args in options:
+        if not isinstance(options, SectionSchema):
+            options = SectionSchema(options)
+        return options.extract(self, section, skip)
+
+    def snapshot(self, schema, factory=None, skip=True):
+        """Get typed values from more sections at once.
+
+        Params:
+            schema  - dictionary of section names and their options like for
+                      get_section method.
+            factory - if is set, it is called with sections as keyword
+                      arguments, so it could be namedtuple.
+            skip    - like for get_section method.
+
+        Return read-only mapping of sections, where each section is
+        read-only mapping of values or result of SectionSchema factory.
+
+        Values of each section are taken in one pass: section is looked up
+        once, each raw value is interpolated once and converted by compiled
+        schema, without get and get_option calls for each option. Parsers
+        which override get method, like EnvironFirst or Lazy, are read by
+        get_section for each section instead.
+
+            >>> from collections import namedtuple
+            >>> from extendparser.get import Get, SectionSchema
+            >>> cp = Get()
+            >>> cp.read_string("[db]\\nport = 5432")
+            >>> Db = namedtuple("Db", ("host", "port"))
+            >>> Config = namedtuple("Config", ("db", ))
+            >>> config = cp.snapshot({"db": SectionSchema(
+            ...     (("host", str, "localhost"), ("port", int)), Db)},
+            ...     Config)
+            >>> config.db.port
+            5432
+        """
+        one_pass = type(self).get is ConfigParser.get
+        sections = {}
+        for section, options in schema.items():
+            if not isinstance(options, SectionSchema):
+                options = SectionSchema(options)
+            if one_pass:
+                values = self._section_values(section, options, skip)
+            else:
+                values = options.extract(self, section, skip)
+            if isinstance(values, dict):
+                values = MappingProxyType(values)
+            sections[section] = values
+        if factory is not None:
+            return factory(**sections)
+        return MappingProxyType(sections)
+
+    def _section_values(self, section, schema, skip):
+        """Return values of section for snapshot, resolved in one pass."""
+        try:
+            values = self._unify_values(section, None)
+        except NoSectionError:
+            values = None
+        before_get = self._interpolation.before_get
+        instrument = self.instrument
+        result = {}
+        missing = None
+        for option, convert, fallback, _ in schema.options:
+            if instrument is not None:
+                instrument.lookup(section, option)
+            name = self.optionxform(option)
             try:
-                if not isinstance(args, (list, tuple)):
-                    args = (args,)
-                values[args[0]] = self.get_option(section, *args)
-            except (NoSectionError, NoOptionError):
-                if not skip:
-                    raise
-        return values
+                if values is None:
+                    raise NoSectionError(section)
+                try:
+                    value = values[name]
+                except KeyError:
+                    raise NoOptionError(name, section) from None
+                if value is not None:
+                    value = before_get(self, section, name, value, values)
+                result[option] = convert(self, value)
+            except (NoSectionError, NoOptionError) as err:
+                try:
+                    result[option] = self._fallback(
+                        section, option, fallback, err)
+                except (NoSectionError, NoOptionError):
+                    if not skip:
+                        raise
+                    if missing is None:
+                        missing = err
+        return schema.create(result, missing)
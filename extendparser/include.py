@@ -27,39 +27,695 @@
         bar
 """
 
-from os.path import exists
-from os import PathLike, fspath
-from configparser import ConfigParser
+import bz2
+import gzip
+import lzma
+import marshal
+
+from re import compile as re_compile
+from asyncio import get_running_loop, wait as async_wait, \
+    FIRST_COMPLETED as ASYNC_FIRST_COMPLETED
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from copy import copy
+from fnmatch import filter as fnfilter
+from functools import lru_cache
+from glob import glob
+from os.path import exists, abspath, basename, dirname, isabs, isdir, \
+    isfile, join, normpath, split
+from os import PathLike, fspath, stat, replace, getcwd, scandir, curdir, \
+    sep, unlink
+from configparser import ConfigParser, Error, DuplicateSectionError, \
+    DuplicateOptionError, MissingSectionHeaderError, ParsingError, \
+    SectionProxy
 from io import StringIO
+from logging import getLogger
+from shutil import copymode
+from tempfile import mkstemp
+from time import perf_counter
 
-__all__ = ["ConfigParser"]
+__all__ = ["ConfigParser", "FragmentCache", "IncludeGraph",
+           "IncludeCycleError", "split_includes", "expand_include",
+           "list_directory", "open_file"]
 
 # pylint: disable=too-many-ancestors
 # pylint: disable=arguments-differ
 
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+CACHE_VERSION = 2
+RE_MAGIC = re_compile(r'[*?[]')
+COMPRESSED = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+
+def open_file(filename, encoding=None, mode='r'):
+    """Open text file, which could be compressed.
+
+    Files with .gz, .bz2 or .xz extension are decompressed while they are
+    read, so uncompressed text is never stored as a whole."""
+    name = fspath(filename)
+    opener = COMPRESSED.get(name[name.rfind('.'):].lower(), open)
+    return opener(filename, mode + 't', encoding=encoding)
+
+
+def split_includes(file_):
+    """Split lines to fragment, tuple of (text, include) segments.
+
+    Include is file name from `.include` expression which follows the text,
+    or None for last segment.
+
+        >>> from extendparser.include import split_includes
+        >>> split_includes(["a = 1\\n", ".include b.ini\\n", "c = 3\\n"])
+        (('a = 1\\n', 'b.ini'), ('c = 3\\n', None))
+    """
+    fragment = []
+    lines = []
+    for line in file_:
+        if line.startswith('.include'):
+            fragment.append(("".join(lines), line[8:].strip()))
+            lines = []
+        else:
+            lines.append(line)
+    fragment.append(("".join(lines), None))
+    return tuple(fragment)
+
+
+def list_directory(path):
+    """Return sorted tuple of regular files names in directory.
+
+    Hidden files, which name starts with dot, are skipped."""
+    with scandir(path) as entries:
+        return tuple(sorted(entry.name for entry in entries
+                            if entry.is_file()
+                            and not entry.name.startswith('.')))
+
+
+def expand_include(include, cache=None, graph=None):
+    """Return tuple of files for `.include` expression.
+
+    Directory is expanded to all its files and pattern with wildcards in
+    last part, like conf.d/*.ini, to matching files; both in sorted order.
+    Other include is returned as is. Directory listing is taken from cache
+    listdir method if cache is set, and scanned directory is added to graph
+    if graph is set.
+
+        >>> from extendparser.include import expand_include
+        >>> expand_include("tests/data/inc*.ini")
+        ('tests/data/include1.ini', 'tests/data/include2.ini')
+    """
+    if RE_MAGIC.search(include) is None:
+        if not isdir(include):
+            return (include, )
+        head, tail = include, '*'
+    else:
+        head, tail = split(include)
+        if RE_MAGIC.search(tail) is None:
+            if not isdir(include):
+                return (include, )
+            head, tail = include, '*'
+    if RE_MAGIC.search(head) is not None:
+        return tuple(name for name in sorted(glob(include)) if isfile(name))
+
+    head = head or curdir
+    if graph is not None:
+        graph.directories.append(abspath(head))
+    try:
+        names = list_directory(head) if cache is None else cache.listdir(head)
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    if head == curdir:
+        return tuple(fnfilter(names, tail))
+    return tuple(join(head, name) for name in fnfilter(names, tail))
+
+
+@contextmanager
+def replacing(filename):
+    """Context which yields descriptor of file, which replaces filename.
+
+    Descriptor is of unique hidden temporary file with .tmp suffix in the
+    same directory, so more processes could write the same file, and
+    include patterns do not match it. Temporary file gets mode of replaced
+    file and replaces it when context ends without error."""
+    filename = fspath(filename)
+    handle, tmp_file = mkstemp(prefix='.%s.' % basename(filename),
+                               suffix='.tmp', dir=dirname(abspath(filename)))
+    try:
+        yield handle
+        if exists(filename):
+            copymode(filename, tmp_file)
+        replace(tmp_file, filename)
+    except BaseException:
+        try:
+            unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+class FragmentCache():
+    """Cache of files split by split_includes function.
+
+    Files are stored by absolute path and encoding, and cached fragment is
+    used while file modification time and size are not changed. One instance
+    could be shared by more parsers:
+
+        >>> from extendparser.include import Include, FragmentCache
+        >>> cache = FragmentCache()
+        >>> first, second = Include(), Include()
+        >>> first.fragment_cache = second.fragment_cache = cache
+
+    Text between includes is parsed only once for parsers with the same
+    syntax settings, next reads only copy parsed values to parser. Count of
+    parsed texts is in `parses` attribute.
+
+    Listings of included directories are cached too, while directory
+    modification time is not changed.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._directories = {}
+        self._parsed = {}       # text: {dialect: parsed values}
+        self.hits = 0
+        self.misses = 0
+        self.parses = 0
+
+    def get(self, filename, encoding=None):
+        """Return fragment of file, or None if file not exists."""
+        path = abspath(fspath(filename))
+        try:
+            stat_ = stat(path)
+        except FileNotFoundError:
+            return None
+        key = (path, encoding)
+        version = (stat_.st_mtime_ns, stat_.st_size)
+        cached = self._fragments.get(key)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        with open_file(path, encoding) as file_:
+            fragment = split_includes(file_)
+        if cached is not None:
+            for text, _ in cached[1]:
+                self._parsed.pop(text, None)
+        self._fragments[key] = (version, fragment)
+        return fragment
+
+    def parse(self, parser, dialect, text, source=None):
+        """Return values of text parsed by parser, parsed only once.
+
+        Dialect is key of parser syntax settings from its _dialect method.
+        """
+        # pylint: disable=protected-access
+        parsed = self._parsed.setdefault(text, {})
+        values = parsed.get(dialect)
+        if values is None:
+            self.parses += 1
+            values = parsed[dialect] = parser._parse_text(text, source)
+        return values
+
+    def listdir(self, path):
+        """Return list_directory result for directory path."""
+        path = abspath(fspath(path))
+        mtime = stat(path).st_mtime_ns
+        cached = self._directories.get(path)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        names = list_directory(path)
+        self._directories[path] = (mtime, names)
+        return names
+
+    def clear(self):
+        """Remove all cached fragments, parsed texts and listings."""
+        self._fragments.clear()
+        self._directories.clear()
+        self._parsed.clear()
+
+
+def fingerprint(path):
+    """Return (path, modification time, size) tuple of file.
+
+    Time and size are None if file does not exist."""
+    try:
+        stat_ = stat(path)
+        return (path, stat_.st_mtime_ns, stat_.st_size)
+    except FileNotFoundError:
+        return (path, None, None)
+
+
+class _Prefetched():
+    """Files read in advance, with the same get method as FragmentCache."""
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.fragments = {}
+        self.directories = {}
+
+    def load(self, filename, encoding=None):
+        """Return fragment of file, or None if file not exists."""
+        if self.cache is not None:
+            return self.cache.get(filename, encoding)
+        try:
+            with open_file(filename, encoding) as file_:
+                return split_includes(file_)
+        except FileNotFoundError:
+            return None
+
+    def get(self, filename, encoding=None):
+        """Return prefetched fragment, or load it now."""
+        key = (abspath(fspath(filename)), encoding)
+        if key not in self.fragments:
+            self.fragments[key] = self.load(filename, encoding)
+        return self.fragments[key]
+
+    def listdir(self, path):
+        """Return directory listing, which is scanned only once."""
+        key = abspath(fspath(path))
+        if key not in self.directories:
+            self.directories[key] = list_directory(path) \
+                if self.cache is None else self.cache.listdir(path)
+        return self.directories[key]
+
+    def parse(self, parser, dialect, text, source=None):
+        """Return parsed values from cache, or parse text now."""
+        # pylint: disable=protected-access
+        if self.cache is not None:
+            return self.cache.parse(parser, dialect, text, source)
+        return parser._parse_text(text, source)
+
+    def _submit(self, submit, pending, filename, encoding=None):
+        key = (abspath(fspath(filename)), encoding)
+        if key not in self.fragments and key not in pending.values():
+            pending[submit(self.load, filename, encoding)] = key
+
+    def _done(self, submit, pending, done):
+        for future in done:
+            fragment = self.fragments[pending.pop(future)] = future.result()
+            for _, include in fragment or ():
+                if include is None:
+                    continue
+                for filename in expand_include(include, self):
+                    # includes are read as default
+                    self._submit(submit, pending, filename)
+
+    def prefetch(self, filenames, encoding, executor):
+        """Read all files and their includes by executor."""
+        pending = {}
+        for filename in filenames:
+            self._submit(executor.submit, pending, filename, encoding)
+        while pending:
+            done = wait(pending, return_when=FIRST_COMPLETED)[0]
+            self._done(executor.submit, pending, done)
+
+    async def aprefetch(self, filenames, encoding, executor=None):
+        """Read all files and their includes by asyncio loop executor."""
+        loop = get_running_loop()
+
+        def submit(func, *args):
+            return loop.run_in_executor(executor, func, *args)
+
+        pending = {}
+        for filename in filenames:
+            self._submit(submit, pending, filename, encoding)
+        while pending:
+            done = (await async_wait(
+                pending, return_when=ASYNC_FIRST_COMPLETED))[0]
+            self._done(submit, pending, done)
+
+
+class IncludeCycleError(Error):
+    """Raised when file includes itself directly or via other files."""
+
+    def __init__(self, chain):
+        super().__init__("Include cycle: %s" % " -> ".join(chain))
+        self.chain = chain
+        self.args = (chain, )
+
+
+@lru_cache(maxsize=1024)
+def _resolve(prefix, filename):
+    """Return normalized path of filename relative to prefix directory."""
+    return normpath(filename if isabs(filename) else prefix + filename)
+
+
+class IncludeGraph():
+    """Graph of files read by Include parser.
+
+    Files are stored by absolute path. Attributes are:
+
+        nodes   - dictionary of read files and lists of their includes
+        order   - list of files in load order
+        times   - dictionary of parse times of files without their
+                  includes, measured only if graph is `timed`
+        missing - list of files which does not exist
+        directories - list of directories scanned for includes
+        cwd     - working directory, for which relative paths are resolved
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, timed=False):
+        self.timed = timed
+        self.cwd = getcwd()
+        self._prefix = self.cwd if self.cwd.endswith(sep) else self.cwd + sep
+        self.nodes = {}
+        self.order = []
+        self.times = {}
+        self.missing = []
+        self.directories = []
+        self._stack = []
+        self._starts = []       # start times of files in stack
+        self._children = []     # parse time of includes in actual file
+
+    @property
+    def edges(self):
+        """List of (parent, include) tuples."""
+        return [(parent, child) for parent, children in self.nodes.items()
+                for child in children]
+
+    def abspath(self, filename):
+        """Return normalized absolute path of file."""
+        filename = fspath(filename)
+        if isinstance(filename, str):
+            return _resolve(self._prefix, filename)
+        return abspath(filename)
+
+    def add_missing(self, filename):
+        """Append file which does not exist."""
+        path = self.abspath(filename)
+        if self._stack:
+            self.nodes[self._stack[-1]].append(path)
+        self.missing.append(path)
+
+    def enter(self, filename, once=False):
+        """Start reading of file, return False if file is skipped.
+
+        Each True result must be followed by leave call."""
+        path = self.abspath(filename)
+        stack = self._stack
+        if path in stack:
+            raise IncludeCycleError(stack[stack.index(path):] + [path])
+        if stack:
+            self.nodes[stack[-1]].append(path)
+        if once and path in self.nodes:
+            return False
+
+        self.nodes.setdefault(path, [])
+        self.order.append(path)
+        stack.append(path)
+        if self.timed:
+            self._children.append(0.0)
+            self._starts.append(perf_counter())
+        return True
+
+    def leave(self):
+        """End reading of actual file."""
+        path = self._stack.pop()
+        if self.timed:
+            elapsed = perf_counter() - self._starts.pop()
+            children = self._children.pop()
+            self.times[path] = self.times.get(path, 0.0) + elapsed - children
+            if self._children:
+                self._children[-1] += elapsed
+
+    @contextmanager
+    def node(self, filename, once=False):
+        """Context of reading file, which yield False if file is skipped."""
+        loaded = self.enter(filename, once)
+        try:
+            yield loaded
+        finally:
+            if loaded:
+                self.leave()
+
+
+class _Sources():
+    """Tracker of options positions in read files.
+
+    Lines are checked by the same regular expressions as ConfigParser use,
+    and positions of all definitions of each option are stored to parser
+    `option_sources`. Positions of section headers are stored to parser
+    `section_sources`, and sets of sections in each source are stored to
+    `source_sections`.
+    """
+    # pylint: disable=protected-access
+
+    def __init__(self, parser):
+        if parser.option_sources is None:
+            parser.option_sources = {}
+            parser.section_sources = {}
+        if parser.source_sections is None:
+            parser.source_sections = {}
+        self.parser = parser
+        self.sources = parser.option_sources
+        self.headers = parser.section_sources
+        self.paths = parser.source_sections
+        self.comments = tuple(getattr(parser, '_comment_prefixes',
+                                      ('#', ';')))
+        self.section = None
+        self.option = None      # last option for continuation lines
+
+    def line(self, line, source, lineno):
+        """Remember option position, if line defines it."""
+        value = line.strip()
+        if not value or value.startswith(self.comments):
+            return
+        if line[0].isspace():
+            if self.option is not None:
+                positions = self.sources[self.option]
+                positions[-1] = positions[-1][:2] + (lineno, )
+            return
+        match = self.parser.SECTCRE.match(value)
+        if match:
+            self.section = match.group('header')
+            self.option = None
+            self.headers.setdefault(self.section, []).append(
+                (source, lineno))
+            self.paths.setdefault(source, set()).add(self.section)
+            return
+        match = self.parser._optcre.match(value)
+        if match and self.section is not None:
+            self.option = (self.section, self.parser.optionxform(
+                match.group('option').rstrip()))
+            self.sources.setdefault(self.option, []).append(
+                (source, lineno, lineno))
+            self.paths.setdefault(source, set()).add(self.section)
+
+    def lines(self, lines, source, lineno=1):
+        """Remember options from lines and return next line number."""
+        for line in lines:
+            self.line(line, source, lineno)
+            lineno += 1
+        return lineno
+
+
+class _Stream():
+    """Lines of config file with expanded includes.
+
+    Stream remembers where each continuous run of lines comes from, so
+    parsing errors could be reported with right source and line number.
+    """
+    # pylint: disable=protected-access
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.lineno = 0         # count of already yielded lines
+        self.starts = []        # first stream line number of each run
+        self.sources = []       # (source, first source line number) of runs
+        self.tracker = _Sources(parser) if parser.track_sources else None
+
+    def lines(self, file_, source):
+        """Yield lines from file_ and included files."""
+        self.starts.append(self.lineno + 1)
+        self.sources.append((source, 1))
+        for lineno, line in enumerate(file_, 1):
+            if line.startswith('.include'):
+                for include in self.parser._includes(line[8:].strip()):
+                    yield from self.lines(
+                        self.parser._path_lines(include), include)
+                self.starts.append(self.lineno + 1)
+                self.sources.append((source, lineno + 1))
+            else:
+                if self.tracker is not None:
+                    self.tracker.line(line, source, lineno)
+                self.lineno += 1
+                yield line
+
+    def origin(self, lineno):
+        """Return source and its line number for stream line number."""
+        index = bisect_right(self.starts, lineno) - 1
+        source, first = self.sources[index]
+        return source, first + lineno - self.starts[index]
+
+    def error(self, err):
+        """Return new exception with right sources and line numbers."""
+        if isinstance(err, DuplicateSectionError):
+            return DuplicateSectionError(
+                err.section, *self.origin(err.lineno))
+        if isinstance(err, DuplicateOptionError):
+            return DuplicateOptionError(
+                err.section, err.option, *self.origin(err.lineno))
+        if isinstance(err, MissingSectionHeaderError):
+            return MissingSectionHeaderError(
+                *self.origin(err.lineno), err.line)
+        first = self.origin(err.errors[0][0])[0]
+        new = ParsingError(first)
+        for lineno, line in err.errors:
+            source, lineno = self.origin(lineno)
+            if source != first:
+                line = "%s: %s" % (source, line)
+            new.append(lineno, line)
+        return new
+
 
 class Include(ConfigParser):
     """ConfigParser which supports includes.
 
     Includes are provide by `.include` keyword on empty line. Including is like
     templating, so each included file expression is replaced in read config
-    string.
+    string. Included directory or pattern like conf.d/*.ini is replaced by
+    all its files in sorted order, see expand_include function. Files with
+    .gz, .bz2 or .xz extension are decompressed while they are read.
+
+    If `fragment_cache` is set to FragmentCache instance, files are read
+    through it, so the same file included many times is opened, split and
+    parsed only once.
+
+    By default, text between includes is read by ConfigParser as standalone
+    part. When `include_stream` is true, lines of file and its included files
+    are passed to ConfigParser as one stream without copying to buffers. In
+    this mode included file continues in actual section and strict parser
+    does not allow to redefine options from included files.
+
+    Each read creates new `include_graph`, IncludeGraph instance. Files which
+    include themselves raise IncludeCycleError. When `include_once` is true,
+    each file is read only once and next includes of the same file are
+    skipped. When `include_timed` is true, parse time of each file is
+    measured to `include_graph.times`.
+
+    When `track_sources` is true, positions of each read option are stored
+    in `option_sources` dictionary as list of (source, first line, last line)
+    tuples by (section, option) key, where the last one is used, and
+    positions of section headers are stored in `section_sources` as lists of
+    (source, line) tuples. Sets of sections defined or continued in each
+    source are stored in `source_sections`. Values and file fingerprints
+    after read are stored in `source_values` and `source_files`, so changes
+    could be written back to read files by extendparser.writeback.write_back
+    function.
+
+    When `instrument` is set to extendparser.stats.Instrument, parse times
+    from `include_graph` are added to it after each read, even if
+    `include_timed` is false.
     """
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=too-many-instance-attributes
+    fragment_cache = None
+    track_sources = False
+    option_sources = None
+    section_sources = None
+    source_sections = None
+    source_values = None
+    source_files = None
+    include_stream = False
+    include_once = False
+    include_timed = False
+    include_graph = None
+    instrument = None
+    _depth = 0
+
+    def _begin(self):
+        """Start reading, graph is created on top level."""
+        if not self._depth:
+            self.include_graph = IncludeGraph(
+                self.include_timed or self.instrument is not None)
+        self._depth += 1
+
+    def _end(self):
+        """End reading, which was started by _begin."""
+        self._depth -= 1
+        if not self._depth:
+            if self.track_sources:
+                self._source_snapshot()
+            if self.instrument is not None:
+                self.instrument.read(self.include_graph)
+
+    @contextmanager
+    def _tree(self):
+        """Context of reading, which creates graph on top level."""
+        self._begin()
+        try:
+            yield
+        finally:
+            self._end()
+
+    def _source_snapshot(self):
+        """Remember values and files after read for write_back."""
+        self.source_values = {
+            (section, option): value
+            for section, options in ((self.default_section, self._defaults),
+                                     *self._sections.items())
+            for option, value in options.items()}
+        if self.source_files is None:
+            self.source_files = {}
+        for path in self.include_graph.order:
+            self.source_files[path] = fingerprint(path)
+
+    def _includes(self, include):
+        """Return files of include expression."""
+        return expand_include(include, self.fragment_cache,
+                              self.include_graph)
 
     def read_file(self, file_, source=None):
         """Overriding method which support .include expression."""
-        config_string = StringIO()
+        self._begin()
+        try:
+            if self.include_stream:
+                self.read_stream(file_, source)
+            else:
+                self.read_fragment(split_includes(file_), source)
+        finally:
+            self._end()
 
-        for line in file_:
-            if line.startswith('.include'):
-                self.read_buffer(config_string, source)
+    def read_stream(self, file_, source=None):
+        """Read file_ and included files as one stream of lines."""
+        if source is None:
+            source = getattr(file_, 'name', '<???>')
+        stream = _Stream(self)
+        with self._tree():
+            try:
+                super().read_file(stream.lines(file_, source), source)
+            except (ParsingError, DuplicateSectionError,
+                    DuplicateOptionError) as err:
+                raise stream.error(err) from None
 
-                self.read(line[8:].strip())     # read includeded ini
-                config_string = StringIO()      # reset config_string
-            else:
-                config_string.write(line)
+    def read_fragment(self, fragment, source=None, cache=None):
+        """Read fragment from split_includes and included files.
 
-        self.read_buffer(config_string, source)
+        If cache is set, text is parsed by its parse method, so values of
+        already parsed text are only copied to parser."""
+        tracker = _Sources(self) if self.track_sources else None
+        dialect = None if cache is None else self._dialect()
+        lineno = 1
+        self._begin()
+        try:
+            for text, include in fragment:
+                if tracker is not None:
+                    lineno = tracker.lines(StringIO(text), source, lineno) + 1
+                    tracker.section = tracker.option = None
+                if cache is None:
+                    self.read_buffer(StringIO(text), source)
+                else:
+                    self._replay(cache.parse(self, dialect, text, source))
+                if include is not None:
+                    # read includeded ini
+                    self.read(self._includes(include))
+        finally:
+            self._end()
 
     def read_buffer(self, buff, source=None):
         """This method read call original methods.
@@ -69,16 +725,203 @@ class Include(ConfigParser):
 
         super().read_file(buff, source)
 
+    def _dialect(self):
+        """Return key of settings, which changes parsing of text."""
+        return (type(self), self.default_section, self.SECTCRE, self._optcre,
+                self._comment_prefixes, self._inline_comment_prefixes,
+                self._strict, self._empty_lines_in_values,
+                getattr(self.optionxform, '__func__', self.optionxform))
+
+    def _settings(self):
+        """Return marshal-able key of settings from _dialect method."""
+        xform = getattr(self.optionxform, '__func__', self.optionxform)
+        return ("%s.%s" % (type(self).__module__, type(self).__qualname__),
+                self.default_section, self.SECTCRE.pattern,
+                self._optcre.pattern, tuple(self._comment_prefixes),
+                tuple(self._inline_comment_prefixes), self._strict,
+                self._empty_lines_in_values,
+                "%s.%s" % (getattr(xform, '__module__', None),
+                           getattr(xform, '__qualname__', None)))
+
+    def _parse_text(self, text, source=None):
+        """Return (defaults, sections) parsed from text by copy of parser.
+
+        Parser is not changed, sections is tuple of (name, options)."""
+        # pylint: disable=protected-access
+        scratch = copy(self)
+        scratch._sections = self._dict()
+        scratch._defaults = self._dict()
+        scratch._proxies = self._dict()
+        scratch._read(StringIO(text), '<???>' if source is None else source)
+        return scratch._defaults, tuple(scratch._sections.items())
+
+    def _replay(self, parsed):
+        """Copy values from _parse_text to parser."""
+        defaults, sections = parsed
+        self._defaults.update(defaults)
+        for section, options in sections:
+            if section not in self._sections:
+                self._sections[section] = self._dict()
+                self._proxies[section] = SectionProxy(self, section)
+            self._sections[section].update(options)
+        clear_cache = getattr(self, "clear_cache", None)
+        if clear_cache is not None:
+            clear_cache()
+
+    def _path_lines(self, filename, encoding=None):
+        """Yield lines of file, or nothing if file not exists.
+
+        Included files are not expanded, so `.include` lines are returned
+        too."""
+        graph = self.include_graph
+        if self.fragment_cache is not None:
+            fragment = self.fragment_cache.get(filename, encoding)
+            if fragment is None:
+                graph.add_missing(filename)
+                return
+            with graph.node(filename, self.include_once) as loaded:
+                for text, include in fragment if loaded else ():
+                    yield from StringIO(text)
+                    if include is not None:
+                        yield ".include %s\n" % include
+        elif exists(filename):
+            with graph.node(filename, self.include_once) as loaded:
+                if loaded:
+                    with open_file(filename, encoding) as file_:
+                        yield from file_
+        else:
+            graph.add_missing(filename)
+
+    def _read_path(self, filename, encoding=None):
+        """Read one file with its includes."""
+        graph = self.include_graph
+        if self.include_stream:
+            self.read_stream(self._path_lines(filename, encoding), filename)
+        elif self.fragment_cache is not None:
+            fragment = self.fragment_cache.get(filename, encoding)
+            if fragment is None:
+                graph.add_missing(filename)
+                return
+            if graph.enter(filename, self.include_once):
+                try:
+                    self.read_fragment(fragment, filename,
+                                       self.fragment_cache)
+                finally:
+                    graph.leave()
+        else:
+            try:
+                file_ = open_file(filename, encoding)
+            except FileNotFoundError:
+                graph.add_missing(filename)
+                return
+            with file_:
+                if graph.enter(filename, self.include_once):
+                    try:
+                        self.read_file(file_, filename)
+                    finally:
+                        graph.leave()
+
     def read(self, filenames, encoding=None):
         """Overriding method to call instance read_file from actual path."""
         if isinstance(filenames, (str, bytes, PathLike)):
             filenames = [filenames]
         read_ok = []
-        for filename in filenames:
-            if exists(filename):
-                with open(filename, 'r', encoding=encoding) as file_:
-                    self.read_file(file_, filename)
-            if isinstance(filename, PathLike):
-                filename = fspath(filename)
-            read_ok.append(filename)
+        self._begin()
+        try:
+            for filename in filenames:
+                self._read_path(filename, encoding)
+                if isinstance(filename, PathLike):
+                    filename = fspath(filename)
+                read_ok.append(filename)
+        finally:
+            self._end()
+        return read_ok
+
+    def _read_prefetched(self, prefetched, filenames, encoding=None):
+        fragment_cache = self.fragment_cache
+        self.fragment_cache = prefetched
+        try:
+            return self.read(filenames, encoding)
+        finally:
+            self.fragment_cache = fragment_cache
+
+    def read_concurrent(self, filenames, encoding=None, max_workers=None):
+        """Read files like read method, but load files by thread pool.
+
+        All files from include tree are read in threads, and then they are
+        parsed in the same order as read method does."""
+        if isinstance(filenames, (str, bytes, PathLike)):
+            filenames = [filenames]
+        prefetched = _Prefetched(self.fragment_cache)
+        with ThreadPoolExecutor(max_workers) as executor:
+            prefetched.prefetch(filenames, encoding, executor)
+        return self._read_prefetched(prefetched, filenames, encoding)
+
+    async def aread(self, filenames, encoding=None, executor=None):
+        """Asyncio variant of read_concurrent method.
+
+        Files are loaded by loop run_in_executor method, so default
+        executor is used if no executor is set."""
+        if isinstance(filenames, (str, bytes, PathLike)):
+            filenames = [filenames]
+        prefetched = _Prefetched(self.fragment_cache)
+        await prefetched.aprefetch(filenames, encoding, executor)
+        return self._read_prefetched(prefetched, filenames, encoding)
+
+    def read_cached(self, filenames, cache_file, encoding=None):
+        """Read files like read method with binary cache of parsed values.
+
+        If cache_file exists and no file from include tree was changed,
+        parsed sections are loaded from cache_file. In other case, files
+        are read and new cache_file is written. Cache stores all values of
+        parser, so it should be used with new parser instance. Cache is
+        used only by parser with the same parsing settings.
+
+        More processes could use the same cache_file at once. If cache_file
+        could not be written, warning is logged and files are still read.
+        """
+        if isinstance(filenames, (str, bytes, PathLike)):
+            filenames = [filenames]
+        filenames = [fspath(filename) for filename in filenames]
+        # everything, which cached values depend on, except files
+        key = (CACHE_VERSION, self._settings(), getcwd(), tuple(filenames),
+               encoding)
+        try:
+            with open(cache_file, 'rb') as file_:
+                data = marshal.load(file_)
+            if data["key"] == key \
+                    and all(fingerprint(item[0]) == item
+                            for item in data["files"]):
+                self._load_cache(data)
+                return data["read_ok"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            pass
+
+        read_ok = self.read(filenames, encoding)
+        graph = self.include_graph
+        data = {
+            "key": key,
+            "read_ok": read_ok,
+            "files": [fingerprint(path) for path in dict.fromkeys(
+                graph.order + graph.missing + graph.directories)],
+            "defaults": dict(self._defaults),
+            "sections": {section: dict(options)
+                         for section, options in self._sections.items()}}
+        try:
+            with replacing(cache_file) as handle, \
+                    open(handle, 'wb') as file_:
+                marshal.dump(data, file_)
+        except OSError as err:
+            log.warning("Cache file %s was not written: %s", cache_file, err)
         return read_ok
+
+    def _load_cache(self, data):
+        """Load parsed values from read_cached data."""
+        self._defaults.update(data["defaults"])
+        for section, options in data["sections"].items():
+            if section not in self._sections:
+                self.add_section(section)
+            self._sections[section].update(options)
+        clear_cache = getattr(self, "clear_cache", None)
+        if clear_cache is not None:
+            clear_cache()
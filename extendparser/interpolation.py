@@ -0,0 +1,124 @@
+"""Interpolation with cache of interpolated values.
+
+    example code:
+
+        >>> from extendparser.get import Get
+        >>> from extendparser.interpolation import CachedInterpolation
+        >>> cp = Get(interpolation=CachedInterpolation())
+        >>> cp.read_string('''
+        ... [main]
+        ... host = localhost
+        ... url = http://%(host)s/
+        ... ''')
+        >>> print(cp.get("main", "url"))
+        http://localhost/
+        >>> cp.set("main", "host", "example.net")
+        >>> print(cp.get("main", "url"))
+        http://example.net/
+"""
+from collections import ChainMap
+from configparser import Interpolation, BasicInterpolation, \
+    ExtendedInterpolation
+
+__all__ = ["CachedInterpolation"]
+
+# pylint: disable=protected-access
+
+
+class CachedInterpolation(Interpolation):
+    """Interpolation, which caches values interpolated by other interpolation.
+
+    For each interpolated value, all options referenced by it, directly or
+    via other options, are remembered. When an option is changed by parser
+    set method, only values which depend on it are removed from cache.
+
+    Each parser must have its own instance. All changes, like set of empty
+    value, reading files or removing options, are handled only by
+    extendparser.get.Get parser. Other parsers call before_set only for
+    non empty values, so they must call clear method after other changes.
+    """
+
+    def __init__(self, interpolation=None):
+        self.interpolation = interpolation or BasicInterpolation()
+        self._extended = isinstance(self.interpolation, ExtendedInterpolation)
+        self._values = {}       # (section, option): (raw value, value)
+        self._dependents = {}   # (section, option): {(section, option), }
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Remove all cached values."""
+        self._values.clear()
+        self._dependents.clear()
+
+    def invalidate(self, section, option):
+        """Remove cached value of option and values which depend on it."""
+        keys = [(section, option)]
+        while keys:
+            key = keys.pop()
+            self._values.pop(key, None)
+            keys.extend(self._dependents.pop(key, ()))
+
+    def _references(self, parser, section, value):
+        """Return (section, option) pairs referenced in raw value."""
+        for name in self.interpolation._KEYCRE.findall(value):
+            if not self._extended:
+                yield section, parser.optionxform(name)
+                continue
+            path = name.split(':')
+            if len(path) == 1:
+                yield section, parser.optionxform(path[0])
+            elif len(path) == 2:
+                yield path[0], parser.optionxform(path[1])
+
+    def _dependencies(self, parser, section, value, defaults):
+        """Return all options which value depends on."""
+        dependencies = set()
+        values = [(section, value)]
+        while values:
+            sect, value = values.pop()
+            for ref in self._references(parser, sect, value):
+                if ref in dependencies:
+                    continue
+                dependencies.add(ref)
+                dependencies.add((parser.default_section, ref[1]))
+                if ref[0] == section:
+                    raw = defaults.get(ref[1])
+                else:
+                    raw = parser.get(*ref, raw=True, fallback=None)
+                if raw:
+                    values.append((ref[0], raw))
+        return dependencies
+
+    def before_get(self, parser, section, option, value, defaults):
+        # values from items method or with vars are not cached
+        if not isinstance(defaults, ChainMap) or defaults.maps[0]:
+            return self.interpolation.before_get(
+                parser, section, option, value, defaults)
+
+        key = (section, option)
+        cached = self._values.get(key)
+        if cached is not None and cached[0] == value:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        result = self.interpolation.before_get(
+            parser, section, option, value, defaults)
+        self._values[key] = (value, result)
+        for dependency in self._dependencies(parser, section, value,
+                                             defaults):
+            self._dependents.setdefault(dependency, set()).add(key)
+        return result
+
+    def before_set(self, parser, section, option, value):
+        self.invalidate(section or parser.default_section,
+                        parser.optionxform(option))
+        return self.interpolation.before_set(parser, section, option, value)
+
+    def before_read(self, parser, section, option, value):
+        return self.interpolation.before_read(parser, section, option, value)
+
+    def before_write(self, parser, section, option, value):
+        return self.interpolation.before_write(
+            parser, section, option, value)
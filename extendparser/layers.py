@@ -0,0 +1,349 @@
+"""Layered configuration sources with merged lookup table.
+
+Layers are stacked from the lowest to the highest priority, for example
+defaults, file trees, environment and command line overrides. Values of all
+layers are merged to one table once, so each lookup is one dictionary
+access. When one layer is changed, only its keys are merged again.
+
+    example code:
+
+        >>> from extendparser.layers import LayeredConfig, DictLayer, \\
+        ...     FileLayer, OverrideLayer
+        >>> config = LayeredConfig((
+        ...     DictLayer("defaults", {"main": {"foo": "default",
+        ...                                     "timeout": "10"}}),
+        ...     FileLayer("files", "tests/data/test.ini"),
+        ...     OverrideLayer("cli", ["main.timeout=30"])))
+        >>> config.get("main", "foo"), config.source("main", "foo")
+        ('bar', 'files')
+        >>> config.get_option("main", "timeout", target=int)
+        30
+        >>> config.override("main", "timeout", "60")
+        >>> config.get("main", "timeout"), config.source("main", "timeout")
+        ('60', 'cli')
+
+Values are interpolated only inside of each FileLayer, references between
+layers are not supported.
+"""
+from configparser import NoSectionError, NoOptionError
+from os import environ
+
+from .environ import VarNameBuilder
+from .frozen import ReadOnlyParser
+from .include import Include
+
+__all__ = ["LayeredConfig", "DictLayer", "FileLayer", "EnvironLayer",
+           "OverrideLayer"]
+
+# pylint: disable=too-few-public-methods
+
+
+def _str(value):
+    """Return value as string, None is kept."""
+    return None if value is None else str(value)
+
+
+class DictLayer():
+    """Layer with values from dictionary of sections.
+
+    Params:
+        name    - name of layer, which is reported by LayeredConfig.source.
+        mapping - dictionary of sections and their dictionaries of options.
+
+    Values are converted to strings like by ConfigParser.read_dict.
+    """
+    depends = False
+
+    def __init__(self, name, mapping=None):
+        self.name = name
+        self.mapping = mapping or {}
+
+    def values(self, keys):
+        """Return dictionary of values by (section, option)."""
+        # pylint: disable=unused-argument
+        return {(section, option): _str(value)
+                for section, options in self.mapping.items()
+                for option, value in options.items()}
+
+
+class OverrideLayer(DictLayer):
+    """Layer for overrides like command line options.
+
+    Overrides could be set as list of `section.option=value` strings.
+    """
+
+    def __init__(self, name, overrides=()):
+        super().__init__(name, {})
+        for item in overrides:
+            key, value = item.split('=', 1)
+            section, option = key.rsplit('.', 1)
+            self.set(section.strip(), option.strip(), value.strip())
+
+    def set(self, section, option, value):
+        """Set override value."""
+        self.mapping.setdefault(section, {})[option] = value
+
+
+class FileLayer():
+    """Layer with values read from files by parser.
+
+    Params:
+        name      - name of layer.
+        filenames - files for parser read method.
+        factory   - callable which returns new parser, Include by default.
+        encoding  - encoding of files.
+
+    Parser of last read is stored in `parser` attribute. Options from
+    default section are returned only in default section.
+    """
+    depends = False
+
+    def __init__(self, name, filenames, factory=Include, encoding=None):
+        self.name = name
+        self.filenames = filenames
+        self.factory = factory
+        self.encoding = encoding
+        self.parser = None
+
+    def values(self, keys):
+        """Read files and return dictionary of values."""
+        # pylint: disable=unused-argument
+        # pylint: disable=protected-access
+        parser = self.factory()
+        parser.read(self.filenames, self.encoding)
+        self.parser = parser
+        values = {(parser.default_section, option):
+                  parser.get(parser.default_section, option)
+                  for option in parser.defaults()}
+        for section, options in parser._sections.items():
+            for option in options:
+                values[(section, option)] = parser.get(section, option)
+        return values
+
+
+class EnvironLayer(VarNameBuilder):
+    """Layer with values from environment variables.
+
+    Environment is not enumerated. Variable is looked up for each key from
+    other layers and for each key from `keys` parameter. Variable names are
+    built by varname method, like for EnvironFirst class. Environment is
+    read again when layer is updated.
+    """
+    depends = True
+
+    def __init__(self, name, keys=(), var_format=None):
+        self.name = name
+        self.keys = tuple(keys)
+        if var_format is not None:
+            self.var_format = var_format
+
+    def values(self, keys):
+        """Return values of variables for keys."""
+        env = dict(environ)
+        values = {}
+        for key in tuple(keys) + self.keys:
+            value = env.get(self.varname(*key))
+            if value is not None:
+                values[key] = value
+        return values
+
+
+class LayeredConfig(ReadOnlyParser):
+    """Read-only parser with merged values of layers.
+
+    Params:
+        layers          - layers from the lowest priority.
+        optionxform     - function for option names, like in ConfigParser.
+        default_section - name of section with default values.
+
+    Layer is object with `name` and `depends` attributes, and values(keys)
+    method, which returns dictionary of values by (section, option) key.
+    Layer with true `depends` needs keys of other layers, so it is updated
+    when some other layer is updated.
+    """
+    __slots__ = ("layers", "_values", "_table", "_sections")
+
+    def __init__(self, layers=(), optionxform=str.lower,
+                 default_section="DEFAULT"):
+        super().__init__(optionxform, default_section=default_section)
+        self.layers = []
+        self._values = []           # normalized values of each layer
+        self._table = {}            # (section, option): (value, layer)
+        self._sections = {}         # count of options in sections
+        for layer in layers:
+            self.layers.append(layer)
+            self._values.append({})
+        self.update()
+
+    def _index(self, name):
+        for index, layer in enumerate(self.layers):
+            if layer.name == name:
+                return index
+        raise KeyError(name)
+
+    def layer(self, name):
+        """Return layer by name."""
+        return self.layers[self._index(name)]
+
+    def add_layer(self, layer, index=None):
+        """Add layer to the top, or to index position."""
+        if index is None:
+            index = len(self.layers)
+        self.layers.insert(index, layer)
+        self._values.insert(index, {})
+        self._load([index])
+        if not layer.depends:
+            self._load(self._dependent(index))
+        self._rebuild()
+
+    def remove_layer(self, name):
+        """Remove layer by name."""
+        index = self._index(name)
+        self.layers.pop(index)
+        self._values.pop(index)
+        self._load(self._dependent(None))
+        self._rebuild()
+
+    def _rebuild(self):
+        """Merge all keys again, when layer indexes are changed."""
+        self._table.clear()
+        self._sections.clear()
+        keys = {}
+        for values in self._values:
+            keys.update(dict.fromkeys(values))
+        self._merge(keys)
+
+    def _dependent(self, changed):
+        """Return indexes of depending layers, except changed one."""
+        return [index for index, layer in enumerate(self.layers)
+                if layer.depends and index != changed]
+
+    def _load(self, indexes):
+        """Load values of layers and return changed keys in order."""
+        changed = {}
+        xform = self._optionxform
+        for index in indexes:
+            layer = self.layers[index]
+            keys = set()
+            if layer.depends:
+                for other, values in enumerate(self._values):
+                    if other != index:
+                        keys.update(values)
+            new = {(section, xform(option)): value for (section, option),
+                   value in layer.values(keys).items()}
+            old = self._values[index]
+            changed.update((key, None) for key in new
+                           if key not in old or old[key] != new[key])
+            changed.update((key, None) for key in old if key not in new)
+            self._values[index] = new
+        return changed
+
+    def _merge(self, keys):
+        """Merge values of keys from the highest layer."""
+        table, sections = self._table, self._sections
+        for key in keys:
+            had = key in table
+            for index in range(len(self.layers) - 1, -1, -1):
+                values = self._values[index]
+                if key in values:
+                    table[key] = (values[key], index)
+                    break
+            else:
+                table.pop(key, None)
+            if had != (key in table):
+                count = sections.get(key[0], 0) + (1 if not had else -1)
+                if count:
+                    sections[key[0]] = count
+                else:
+                    sections.pop(key[0], None)
+
+    def update(self, name=None):
+        """Load layer again and merge changed values.
+
+        If name is not set, all layers are loaded. Layers which depend on
+        keys of other layers are loaded too.
+        """
+        if name is None:
+            changed = self._load(
+                [index for index, layer in enumerate(self.layers)
+                 if not layer.depends])
+            changed.update(self._load(self._dependent(None)))
+        else:
+            index = self._index(name)
+            changed = self._load([index])
+            if not self.layers[index].depends:
+                changed.update(self._load(self._dependent(index)))
+        self._merge(changed)
+
+    def override(self, section, option, value, name=None):
+        """Set value to the highest OverrideLayer or to named layer.
+
+        When key is new, layers which depend on keys are loaded again."""
+        if name is None:
+            name = next((layer.name for layer in reversed(self.layers)
+                         if isinstance(layer, OverrideLayer)), None)
+            if name is None:
+                raise ValueError("No OverrideLayer for override of "
+                                 "[%s]::%s" % (section, option))
+        index = self._index(name)
+        self.layers[index].set(section, option, value)
+        key = (section, self._optionxform(option))
+        new = not any(key in values for values in self._values)
+        self._values[index][key] = _str(value)
+        changed = {key: None}
+        if new and not self.layers[index].depends:
+            changed.update(self._load(self._dependent(index)))
+        self._merge(changed)
+
+    def _item(self, section, option):
+        item = self._table.get((section, option))
+        if item is not None:
+            return item
+        if section not in self._sections and \
+                section != self.default_section:
+            raise NoSectionError(section)
+        item = self._table.get((self.default_section, option))
+        if item is None:
+            raise NoOptionError(option, section)
+        return item
+
+    def _lookup(self, section, option):
+        return self._item(section, option)[0]
+
+    def source(self, section, option):
+        """Return name of layer, which supplies option value."""
+        return self.layers[
+            self._item(section, self._optionxform(option))[1]].name
+
+    def sections(self):
+        """Return list of section names, excluding default section."""
+        return [section for section in self._sections
+                if section != self.default_section]
+
+    def has_section(self, section):
+        """Indicate whether the named section is present."""
+        return section != self.default_section and section in self._sections
+
+    def options(self, section):
+        """Return list of option names for section with defaults."""
+        return [option for option, _ in self.items(section)]
+
+    def has_option(self, section, option):
+        """Check for the existence of option in section."""
+        try:
+            self._item(section, self._optionxform(option))
+            return True
+        except (NoSectionError, NoOptionError):
+            return False
+
+    def items(self, section):
+        """Return list of (name, value) tuples for section."""
+        if section not in self._sections and \
+                section != self.default_section:
+            raise NoSectionError(section)
+        items = {option: item[0] for (section_, option), item
+                 in self._table.items() if section_ == section}
+        for (section_, option), item in self._table.items():
+            if section_ == self.default_section:
+                items.setdefault(option, item[0])
+        return list(items.items())
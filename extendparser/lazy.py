@@ -0,0 +1,228 @@
+"""ConfigParser with lazy loading of sections.
+
+    example code:
+
+        >>> from extendparser.lazy import Lazy
+        >>> cp = Lazy()
+        >>> cp.read_lazy("tests/data/test.ini")
+        ['tests/data/test.ini']
+        >>> cp.sections()
+        ['main', 'sec']
+        >>> cp.pending_sections()
+        ['main', 'sec']
+        >>> print(cp.get("main", "foo"))
+        bar
+        >>> cp.pending_sections()
+        ['sec']
+"""
+import re
+
+from configparser import ParsingError, DuplicateSectionError, \
+    DuplicateOptionError
+from io import StringIO
+from locale import getpreferredencoding
+from mmap import mmap, ACCESS_READ
+from os import PathLike, fspath
+from os.path import exists, splitext
+
+from .include import Include, COMPRESSED, _Stream
+
+__all__ = ["Lazy"]
+
+# pylint: disable=too-many-ancestors
+# pylint: disable=arguments-differ
+
+RE_MARK = re.compile(rb"^(?:(?P<header>\[[^\r\n]*)|"
+                     rb"\.include(?P<include>[^\r\n]*))\r?$",
+                     re.MULTILINE)
+
+
+class Lazy(Include):
+    """Include parser, which could read sections on first access.
+
+    Method read_lazy scans files by mmap for section headers and `.include`
+    expressions, and remembers byte offsets of each section. Section is
+    parsed when its value is needed by get, items, options, has_option, set
+    or remove_option methods, or by get_option and get_section from Get
+    class. Default section and text outside sections are parsed
+    immediately. Files must not be changed until all sections are loaded.
+
+    Each part of section is parsed separately, like text between includes
+    in Include parser, so strict parser does not check duplicate sections.
+
+    Compressed files could not be indexed, so they are parsed immediately,
+    with all sections which are pending before them.
+    """
+    _pending = None
+
+    def read_lazy(self, filenames, encoding=None):
+        """Index sections of files, which will be parsed on access."""
+        if isinstance(filenames, (str, bytes, PathLike)):
+            filenames = [filenames]
+        if self._pending is None:
+            self._pending = {}
+        read_ok = []
+        with self._tree():
+            for filename in filenames:
+                self._index(filename, encoding)
+                if isinstance(filename, PathLike):
+                    filename = fspath(filename)
+                read_ok.append(filename)
+        return read_ok
+
+    def _index(self, filename, encoding=None):
+        """Index sections of one file and its includes."""
+        graph = self.include_graph
+        if not exists(filename):
+            graph.add_missing(filename)
+            return
+        if splitext(fspath(filename))[1].lower() in COMPRESSED:
+            self._read_path(filename, encoding)
+            return
+        with graph.node(filename, self.include_once) as loaded:
+            if not loaded:
+                return
+            with open(filename, 'rb') as file_:
+                size = file_.seek(0, 2)
+                if not size:
+                    return
+                with mmap(file_.fileno(), 0, access=ACCESS_READ) as data:
+                    self._index_data(data, size, filename, encoding)
+
+    def _index_data(self, data, size, filename, encoding):
+        """Index chunks of file data between marks."""
+        marks = list(self._marks(data, encoding))
+        # text before first mark is outside any section
+        self._chunk(data, None, (0, marks[0][0] if marks else size, 1),
+                    filename, encoding)
+        for i, (start, end, first, header, include) in enumerate(marks):
+            stop = marks[i+1][0] if i+1 < len(marks) else size
+            if include is not None:
+                for name in self._includes(include.decode(
+                        encoding or getpreferredencoding(False)).strip()):
+                    self._index(name)
+                self._chunk(data, None, (end, stop, first),
+                            filename, encoding)
+            else:
+                self._chunk(data, header, (start, stop, first),
+                            filename, encoding)
+
+    def _marks(self, data, encoding):
+        """Yield start, end, line number, section and include of section
+        headers and `.include` expressions, which are matched like by
+        parser."""
+        encoding = encoding or getpreferredencoding(False)
+        lineno, offset = 1, 0
+        for match in RE_MARK.finditer(data):
+            section = match.group('header')
+            if section is not None:
+                header = self.SECTCRE.match(section.decode(encoding).strip())
+                if header is None:
+                    continue
+                section = header.group('header')
+            lineno += data[offset:match.start()].count(b'\n')
+            offset = match.start()
+            yield (match.start(), match.end(), lineno, section,
+                   match.group('include'))
+
+    def _chunk(self, data, section, chunk, filename, encoding):
+        """Remember section chunk or parse text outside section.
+
+        Chunk is (start, stop, first line number) of text in data."""
+        encoding = encoding or getpreferredencoding(False)
+        if section is not None:
+            if section != self.default_section:
+                if section not in self._sections:
+                    self.add_section(section)
+                self._pending.setdefault(section, []).append(
+                    (filename, chunk, encoding))
+                return
+        start, stop, first = chunk
+        text = data[start:stop].decode(encoding)
+        if text.strip():
+            self._parse(text, filename, first)
+
+    def _parse(self, text, filename, first):
+        """Parse text, which starts on first line of file."""
+        try:
+            self.read_buffer(StringIO(text, newline=None), filename)
+        except (ParsingError, DuplicateSectionError,
+                DuplicateOptionError) as err:
+            stream = _Stream(self)
+            stream.starts, stream.sources = [1], [(filename, first)]
+            raise stream.error(err) from None
+
+    def _load(self, section):
+        """Parse pending chunks of section.
+
+        Chunks stay pending until all are parsed, so parsing error is raised
+        on each access."""
+        for filename, (start, stop, first), encoding in \
+                self._pending[section]:
+            with open(filename, 'rb') as file_:
+                file_.seek(start)
+                text = file_.read(stop - start).decode(encoding)
+            self._parse(text, filename, first)
+        del self._pending[section]
+
+    def _need(self, section):
+        """Parse section if it is pending."""
+        if self._pending and section in self._pending:
+            self._load(section)
+
+    def load_all(self):
+        """Parse all pending sections."""
+        while self._pending:
+            self._load(next(iter(self._pending)))
+
+    def pending_sections(self):
+        """Return list of sections, which was not parsed yet."""
+        return list(self._pending or ())
+
+    def read(self, filenames, encoding=None):
+        self.load_all()
+        return super().read(filenames, encoding)
+
+    def read_file(self, file_, source=None):
+        self.load_all()
+        super().read_file(file_, source)
+
+    def read_dict(self, dictionary, source='<dict>'):
+        self.load_all()
+        super().read_dict(dictionary, source)
+
+    def get(self, section, option, **kwargs):
+        self._need(section)
+        return super().get(section, option, **kwargs)
+
+    def items(self, section=None, **kwargs):
+        if section is None:
+            self.load_all()
+            return super().items(**kwargs)
+        self._need(section)
+        return super().items(section, **kwargs)
+
+    def options(self, section):
+        self._need(section)
+        return super().options(section)
+
+    def has_option(self, section, option):
+        self._need(section)
+        return super().has_option(section, option)
+
+    def set(self, section, option, value=None):
+        self._need(section)
+        super().set(section, option, value)
+
+    def remove_option(self, section, option):
+        self._need(section)
+        return super().remove_option(section, option)
+
+    def remove_section(self, section):
+        if self._pending:
+            self._pending.pop(section, None)
+        return super().remove_section(section)
+
+    def write(self, fp, space_around_delimiters=True):
+        self.load_all()
+        super().write(fp, space_around_delimiters)
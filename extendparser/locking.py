@@ -0,0 +1,194 @@
+"""Reader-writer locking for parsers shared between threads.
+
+Concurrent class wraps reading methods by read lock and changing methods by
+write lock, so many threads could get values at once while read of whole
+include tree, set or read_dict are exclusive. Readers never see half read
+include tree.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.locking import Concurrent
+        >>> class Parser(Concurrent, ExtendParser):
+        ...     pass
+        >>> cp = Parser()
+        >>> cp.read("tests/data/test.ini")
+        ['tests/data/test.ini']
+        >>> print(cp.get("main", "foo"))
+        bar
+        >>> with cp.lock.write_locked():    # more changes at once
+        ...     cp.set("main", "foo", "baz")
+        ...     cp.set("main", "key", "new")
+
+If parser is only replaced by new one, like Watcher does, or if values are
+read from FrozenParser, locking is not needed.
+"""
+from contextlib import contextmanager
+from configparser import ConfigParser
+from threading import Condition, Lock, local, get_ident
+
+__all__ = ["RWLock", "Concurrent"]
+
+# pylint: disable=too-many-ancestors
+
+
+class RWLock():
+    """Reader-writer lock which prefers writers.
+
+    More threads could hold read lock at once, write lock is exclusive.
+    New readers wait while some writer is waiting, so writers are not
+    starved. Both locks are reentrant and writer could take read lock too.
+    Read lock could not be upgraded to write lock, RuntimeError is raised
+    instead of deadlock.
+    """
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0           # count of threads holding read lock
+        self._writers_waiting = 0
+        self._writer = None         # ident of thread holding write lock
+        self._write_depth = 0
+        self._local = local()       # read lock depth of thread
+
+    def acquire_read(self):
+        """Acquire read lock, blocking while writer holds or waits."""
+        local_ = self._local
+        depth = getattr(local_, "depth", 0)
+        if depth or self._writer == get_ident():
+            local_.depth = depth + 1
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local_.depth = 1
+
+    def release_read(self):
+        """Release read lock."""
+        local_ = self._local
+        local_.depth -= 1
+        if local_.depth or self._writer == get_ident():
+            return
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        """Acquire exclusive write lock."""
+        ident = get_ident()
+        if self._writer == ident:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("Read lock could not be upgraded")
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = ident
+            self._write_depth = 1
+
+    def release_write(self):
+        """Release write lock.
+
+        If thread still holds read lock, it continues as reader."""
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._cond:
+            self._writer = None
+            if getattr(self._local, "depth", 0):
+                self._readers += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """Context with read lock."""
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """Context with write lock."""
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+def _reader(name):
+    """Return method, which calls parent method with read lock."""
+    def method(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return getattr(super(Concurrent, self), name)(*args, **kwargs)
+        finally:
+            lock.release_read()
+    method.__name__ = name
+    method.__doc__ = "%s with read lock." % name
+    return method
+
+
+def _writer(name):
+    """Return method, which calls parent method with write lock."""
+    def method(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return getattr(super(Concurrent, self), name)(*args, **kwargs)
+        finally:
+            lock.release_write()
+    method.__name__ = name
+    method.__doc__ = "%s with write lock." % name
+    return method
+
+
+class Concurrent(ConfigParser):
+    """ConfigParser with reader-writer lock in `lock` attribute.
+
+    Class must be first in bases, so its methods wrap methods of other
+    extensions. Only public methods are locked; Lazy parser, which parses
+    sections when they are read, is not supported.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # ConfigParser constructor could call read_dict with defaults
+        self.lock = RWLock()
+        super().__init__(*args, **kwargs)
+
+    # readers
+    get = _reader("get")
+    items = _reader("items")
+    options = _reader("options")
+    sections = _reader("sections")
+    defaults = _reader("defaults")
+    has_option = _reader("has_option")
+    has_section = _reader("has_section")
+    get_option = _reader("get_option")
+    get_section = _reader("get_section")
+    snapshot = _reader("snapshot")
+    freeze = _reader("freeze")
+    write = _reader("write")
+    __contains__ = _reader("__contains__")
+
+    # writers
+    read = _writer("read")
+    read_file = _writer("read_file")
+    read_string = _writer("read_string")
+    read_dict = _writer("read_dict")
+    read_cached = _writer("read_cached")
+    set = _writer("set")
+    add_section = _writer("add_section")
+    remove_option = _writer("remove_option")
+    remove_section = _writer("remove_section")
+    __setitem__ = _writer("__setitem__")
+    __delitem__ = _writer("__delitem__")
@@ -0,0 +1,199 @@
+"""Parser values published in shared memory for more processes.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.shared import publish, SharedConfig
+        >>> cp = ExtendParser()
+        >>> cp.read_string("[server]\\nport = 8080\\nworkers = 4")
+        >>> memory = publish(cp)
+        >>> config = SharedConfig.attach(memory.name)
+        >>> config.getint("server", "port")
+        8080
+        >>> config.close()
+        >>> memory.close()
+        >>> memory.unlink()
+"""
+from bisect import bisect_left
+from configparser import DEFAULTSECT, NoSectionError, NoOptionError
+from mmap import mmap, ACCESS_READ
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct, error as StructError
+from weakref import WeakValueDictionary
+
+import sys
+
+from .frozen import ReadOnlyParser, FrozenParser
+
+__all__ = ["encode", "publish", "SharedConfig"]
+
+MAGIC = b"EPSC"
+HEADER = Struct("<4sII")        # magic, version, count of entries
+ENTRY = Struct("<IIII")         # key offset, key size, value offset and size
+VERSION = 1
+NONE = 0xFFFFFFFF               # value size of None value
+
+_PUBLISHED = WeakValueDictionary()  # tracked memory of this process by name
+
+
+def _key(section, option=""):
+    return ("%s\0%s" % (section, option)).encode("utf-8")
+
+
+def encode(parser):
+    """Return bytes with interpolated values of parser.
+
+    Values are sorted by section and option, so SharedConfig could find
+    them by binary search. Default values are stored in each section.
+    """
+    frozen = FrozenParser(parser)
+    items = []
+    for section in [frozen.default_section] + frozen.sections():
+        items.append((_key(section), None))
+        for option, value in frozen.items(section):
+            items.append((_key(section, option), value))
+    items.sort(key=lambda item: item[0])
+
+    table_size = HEADER.size + ENTRY.size * len(items)
+    table = [HEADER.pack(MAGIC, VERSION, len(items))]
+    blob = []
+    offset = table_size
+    for key, value in items:
+        value = None if value is None else value.encode("utf-8")
+        table.append(ENTRY.pack(offset, len(key), offset + len(key),
+                                NONE if value is None else len(value)))
+        blob.append(key)
+        offset += len(key)
+        if value is not None:
+            blob.append(value)
+            offset += len(value)
+    return b"".join(table + blob)
+
+
+def publish(parser, name=None):
+    """Create SharedMemory with encoded parser values.
+
+    Caller is owner of shared memory, so it must call its close and unlink
+    methods, when it is no longer needed."""
+    data = encode(parser)
+    memory = SharedMemory(name, create=True, size=len(data))
+    memory.buf[:len(data)] = data
+    _PUBLISHED[memory.name] = memory
+    return memory
+
+
+class _Keys():
+    """Sequence of keys in buffer for bisect function."""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, buffer, count):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        offset, size = ENTRY.unpack_from(
+            self.buffer, HEADER.size + ENTRY.size * index)[:2]
+        return bytes(self.buffer[offset:offset+size])
+
+
+class SharedConfig(ReadOnlyParser):
+    """Read-only parser, which reads values directly from buffer.
+
+    Buffer could be shared memory, mmap or bytes with data created by
+    encode function. Each lookup is binary search in buffer, so values are
+    not copied to each process memory. Option names are transformed by
+    optionxform function, which must be the same as parser used.
+    """
+    __slots__ = ("_buffer", "_count", "_keys", "_memory")
+
+    def __init__(self, buffer, optionxform=str.lower,
+                 default_section=DEFAULTSECT):
+        super().__init__(optionxform, default_section=default_section)
+        self._buffer = memoryview(buffer)
+        try:
+            magic, version, self._count = HEADER.unpack_from(self._buffer)
+        except StructError:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Buffer does not contain encoded config")
+        self._keys = _Keys(self._buffer, self._count)
+        self._memory = None
+
+    @classmethod
+    def attach(cls, name, **kwargs):
+        """Return SharedConfig for SharedMemory with name.
+
+        Attached memory is not tracked by resource tracker, so it is not
+        unlinked when process ends. Only publisher owns it, and its memory
+        stays tracked, when it is attached in the same process."""
+        if sys.version_info >= (3, 13):
+            # pylint: disable=unexpected-keyword-arg
+            memory = SharedMemory(name, track=False)
+        else:
+            # pylint: disable=protected-access
+            memory = SharedMemory(name)
+            # only posix memory is tracked
+            if memory._fd >= 0 and memory.name not in _PUBLISHED:
+                resource_tracker.unregister(memory._name, "shared_memory")
+        config = cls(memory.buf, **kwargs)
+        config._memory = memory     # pylint: disable=protected-access
+        return config
+
+    @classmethod
+    def from_file(cls, filename, **kwargs):
+        """Return SharedConfig for file with encoded data mapped by mmap."""
+        with open(filename, 'rb') as file_:
+            data = mmap(file_.fileno(), 0, access=ACCESS_READ)
+        try:
+            config = cls(data, **kwargs)
+        except ValueError:
+            data.close()
+            raise
+        config._memory = data       # pylint: disable=protected-access
+        return config
+
+    def close(self):
+        """Release buffer and close shared memory or mmap it was created
+        with."""
+        self._buffer.release()
+        if self._memory is not None:
+            self._memory.close()
+            self._memory = None
+
+    def _find(self, key):
+        """Return index of key or None."""
+        index = bisect_left(self._keys, key)
+        if index < self._count and self._keys[index] == key:
+            return index
+        return None
+
+    def _lookup(self, section, option):
+        index = self._find(_key(section, option))
+        if index is None:
+            if self._find(_key(section)) is None:
+                raise NoSectionError(section)
+            raise NoOptionError(option, section)
+        offset, size = ENTRY.unpack_from(
+            self._buffer, HEADER.size + ENTRY.size * index)[2:]
+        if size == NONE:
+            return None
+        return str(self._buffer[offset:offset+size], "utf-8")
+
+    def _sections(self):
+        for index in range(self._count):
+            section, option = self._keys[index].decode("utf-8").split("\0")
+            if not option and section != self.default_section:
+                yield section
+
+    def sections(self):
+        """Return list of section names, excluding default section."""
+        return list(self._sections())
+
+    def has_section(self, section):
+        """Indicate whether the named section is present."""
+        return section != self.default_section \
+            and self._find(_key(section)) is not None
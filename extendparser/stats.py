@@ -0,0 +1,130 @@
+"""Optional instrumentation of parser operations.
+
+Parsers have `instrument` attribute set to None, so disabled
+instrumentation costs only one attribute check. When Instrument instance
+is set, lookups from get_option, fallback values, environment hits and
+parse times of read files are counted.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.stats import Instrument
+        >>> cp = ExtendParser()
+        >>> cp.instrument = Instrument()
+        >>> cp.read_string("[main]\\nport = 80")
+        >>> cp.get_option("main", "port", target=int)
+        80
+        >>> cp.get_option("main", "timeout", target=float, fallback=1.0)
+        1.0
+        >>> stats = cp.stats()
+        >>> stats["lookups"][("main", "port")], stats["fallbacks"]
+        (1, {('main', 'timeout'): 1})
+
+    Hooks are called with event name, key and value, so counters could be
+    exported to metrics system:
+
+        >>> events = []
+        >>> cp.instrument.add_hook(lambda *args: events.append(args))
+        >>> cp.get_option("main", "port", target=int)
+        80
+        >>> events
+        [('lookup', ('main', 'port'), 2)]
+"""
+from collections import Counter
+from logging import getLogger
+
+__all__ = ["Instrument"]
+
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+
+class Instrument():
+    """Counters of parser operations.
+
+    Attributes are:
+
+        lookups      - Counter of get_option calls by (section, option)
+        fallbacks    - Counter of returned fallback values
+        missing      - Counter of missing options without fallback
+        environ_hits - Counter of values resolved from environment
+        file_times   - dictionary of parse times of files without their
+                       includes, summed over all reads
+        reads        - count of top level reads of include trees
+
+    Hooks are called as hook(event, key, value), where event is one of
+    lookup, fallback, missing, environ or file; key is (section, option)
+    or file path and value is new count or parse time of file. Exceptions
+    from hooks are logged and ignored.
+    """
+
+    def __init__(self):
+        self.lookups = Counter()
+        self.fallbacks = Counter()
+        self.missing = Counter()
+        self.environ_hits = Counter()
+        self.file_times = {}
+        self.reads = 0
+        self.hooks = []
+
+    def add_hook(self, hook):
+        """Add hook callback."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Remove hook callback."""
+        self.hooks.remove(hook)
+
+    def _emit(self, event, key, value):
+        for hook in self.hooks:
+            try:
+                hook(event, key, value)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Instrument hook %r failed", hook)
+
+    def _count(self, counter, event, section, option):
+        key = (section, option)
+        counter[key] += 1
+        if self.hooks:
+            self._emit(event, key, counter[key])
+
+    def lookup(self, section, option):
+        """Count option lookup."""
+        self._count(self.lookups, "lookup", section, option)
+
+    def fallback(self, section, option):
+        """Count returned fallback value."""
+        self._count(self.fallbacks, "fallback", section, option)
+
+    def missed(self, section, option):
+        """Count missing option without fallback."""
+        self._count(self.missing, "missing", section, option)
+
+    def environ_hit(self, section, option):
+        """Count value resolved from environment."""
+        self._count(self.environ_hits, "environ", section, option)
+
+    def read(self, graph):
+        """Add parse times of files from IncludeGraph."""
+        self.reads += 1
+        for path, elapsed in graph.times.items():
+            self.file_times[path] = self.file_times.get(path, 0.0) + elapsed
+            if self.hooks:
+                self._emit("file", path, elapsed)
+
+    def reset(self):
+        """Reset all counters, hooks are kept."""
+        self.lookups.clear()
+        self.fallbacks.clear()
+        self.missing.clear()
+        self.environ_hits.clear()
+        self.file_times.clear()
+        self.reads = 0
+
+    def snapshot(self):
+        """Return copy of counters as dictionary."""
+        return {"lookups": dict(self.lookups),
+                "fallbacks": dict(self.fallbacks),
+                "missing": dict(self.missing),
+                "environ_hits": dict(self.environ_hits),
+                "file_times": dict(self.file_times),
+                "reads": self.reads}
@@ -0,0 +1,143 @@
+"""Reloading parser when files of include tree are changed.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.watch import Watcher
+        >>> watcher = Watcher(ExtendParser, "tests/data/test.ini")
+        >>> print(watcher.parser.get("main", "foo"))
+        bar
+        >>> watcher.check()
+        set()
+"""
+from logging import getLogger
+from os import fspath
+from os.path import abspath
+from threading import Thread, Event
+
+from .diff import ChangeNotifier, diff
+from .include import FragmentCache, fingerprint
+
+__all__ = ["Watcher"]
+
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+
+def _sections(old, new, files):
+    """Return sections, which could be changed by files."""
+    # pylint: disable=protected-access
+    sections = old._sections.keys() ^ new._sections.keys()
+    for parser in (old, new):
+        for source, names in parser.source_sections.items():
+            if abspath(fspath(source)) in files:
+                sections.update(names)
+    return sections
+
+
+class Watcher():
+    """Watch files read by Include parser and reload them when changed.
+
+    Params:
+        factory  - callable, which returns new Include parser instance.
+        filenames - files to read by parser read method.
+        encoding - encoding of files.
+        interval - seconds between checks in background thread.
+
+    Files are checked by modification time and size. When some file is
+    changed, new parser is created and read, and `parser` attribute is
+    replaced by it, so readers always see complete configuration.
+    Unchanged files are not read again, they are taken from FragmentCache.
+    Subscribed callbacks are called with new parser and set of changed
+    (section, option) pairs. Callbacks for some sections or options could be
+    subscribed to `notifier` ChangeNotifier, they are called with ConfigDiff.
+
+    When parser has `track_sources` set, only sections from changed files
+    are compared.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, factory, filenames, encoding=None, interval=1.0):
+        self.factory = factory
+        self.filenames = filenames
+        self.encoding = encoding
+        self.interval = interval
+        self.fragment_cache = FragmentCache()
+        self.parser = None
+        self._files = ()
+        self._callbacks = []
+        self.notifier = ChangeNotifier()
+        self._stop = Event()
+        self._thread = None
+        self.reload()
+
+    def subscribe(self, callback):
+        """Add callback(parser, changed) called after reload."""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove callback."""
+        self._callbacks.remove(callback)
+
+    def changed_files(self):
+        """Return list of files, which was changed from last reading."""
+        return [item[0] for item in self._files
+                if fingerprint(item[0]) != item]
+
+    def reload(self, files=None):
+        """Read files to new parser and return set of changed options.
+
+        If files are set, only options from these files are compared."""
+        parser = self.factory()
+        parser.fragment_cache = self.fragment_cache
+        parser.read(self.filenames, self.encoding)
+        graph = parser.include_graph
+        fingerprints = tuple(fingerprint(path) for path in dict.fromkeys(
+            graph.order + graph.missing + graph.directories))
+
+        old, old_fingerprints = self.parser, self._files
+        self.parser, self._files = parser, fingerprints
+        if old is None:
+            return set()
+
+        sections = None
+        if files is not None and old.source_sections is not None \
+                and parser.source_sections is not None:
+            # changed files and files which was (not) included before
+            files = set(files).union(
+                {item[0] for item in fingerprints}.symmetric_difference(
+                    item[0] for item in old_fingerprints))
+            sections = _sections(old, parser, files)
+        delta = diff(old, parser, sections)
+        changed = delta.keys()
+        if delta:
+            for callback in tuple(self._callbacks):
+                callback(parser, changed)
+            self.notifier.notify(delta)
+        return changed
+
+    def check(self):
+        """Reload files if some was changed and return changed options."""
+        files = self.changed_files()
+        if files:
+            return self.reload(files)
+        return set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Reloading %s failed", self.filenames)
+
+    def start(self):
+        """Start checking files in background thread."""
+        self._stop.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
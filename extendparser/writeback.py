@@ -0,0 +1,298 @@
+"""Writing changed options back to files, from which they were read.
+
+Parser must have `track_sources` set, so positions of options and section
+headers are known. Only files with changed options are rewritten, and
+other lines, comments and `.include` expressions are kept.
+
+    example code:
+
+        >>> from extendparser import ExtendParser
+        >>> from extendparser.writeback import write_back
+        >>> cp = ExtendParser()
+        >>> cp.track_sources = True
+        >>> cp.read("tests/data/test.ini")
+        ['tests/data/test.ini']
+        >>> write_back(cp)
+        []
+
+Changed option is replaced on its place, removed option or section is
+deleted, new option is appended to the last block of its section and new
+section is appended to the first read file. When option is defined more
+times, in one or more files, only the last definition, which was used, is
+changed, but all definitions of removed option are deleted, so no earlier
+value is used after next read.
+"""
+from configparser import Error
+from logging import getLogger
+from os import fspath
+from os.path import abspath, splitext
+
+from .include import COMPRESSED, fingerprint, open_file, replacing, \
+    _Sources
+
+__all__ = ["write_back", "pending_changes", "SourceChangedError"]
+
+log = getLogger(__package__)  # pylint: disable=invalid-name
+
+# pylint: disable=protected-access
+
+_MISSING = object()
+
+
+class SourceChangedError(Error):
+    """File was changed after it was read by parser."""
+
+    def __init__(self, path):
+        super().__init__("File %s was changed after read" % path)
+        self.path = path
+        self.args = (path, )
+
+
+def _values(parser):
+    """Return dictionary of all raw values by (section, option)."""
+    return {(section, option): value
+            for section, options in ((parser.default_section,
+                                      parser._defaults),
+                                     *parser._sections.items())
+            for option, value in options.items()}
+
+
+def pending_changes(parser):
+    """Return dictionary of (old, new) values changed from last read.
+
+    Missing values are None, which is the same as option without value."""
+    old = parser.source_values or {}
+    new = _values(parser)
+    return {key: (old.get(key), new.get(key))
+            for key in _changed(old, new)}
+
+
+def _changed(old, new):
+    """Return list of keys with different values in parser order."""
+    keys = dict.fromkeys(old)
+    keys.update(dict.fromkeys(new))
+    return [key for key in keys
+            if old.get(key, _MISSING) != new.get(key, _MISSING)]
+
+
+def _format(option, value, delimiter='='):
+    """Return lines of option with value."""
+    if value is None:
+        return ["%s\n" % option]
+    return ["%s %s %s\n" % (option, delimiter,
+                            str(value).replace('\n', '\n\t'))]
+
+
+class _File():
+    """Lines of one file and their edits."""
+
+    def __init__(self, path, encoding):
+        self.path = path
+        with open_file(path, encoding) as file_:
+            self.lines = file_.readlines()
+        if self.lines and not self.lines[-1].endswith('\n'):
+            self.lines[-1] += '\n'
+        self.edits = []     # (first, last, lines), numbered from 1
+        self.appended = []  # lines appended after all edits
+
+    def block_end(self, parser, header):
+        """Return last line of section block which starts by header."""
+        end = header
+        comments = tuple(getattr(parser, '_comment_prefixes', ('#', ';')))
+        for lineno in range(header + 1, len(self.lines) + 1):
+            line = self.lines[lineno - 1]
+            value = line.strip()
+            if line.startswith('.include') \
+                    or parser.SECTCRE.match(value):
+                break
+            if value and not value.startswith(comments):
+                end = lineno
+        return end
+
+    def replace(self, parser, first, last, value):
+        """Replace option on lines first..last by new value."""
+        match = parser._optcre.match(self.lines[first - 1].strip())
+        option, delimiter = match.group('option').rstrip(), '='
+        if match.group('vi'):
+            delimiter = match.group('vi')
+        self.edits.append((first, last, _format(option, value, delimiter)))
+
+    def remove(self, first, last):
+        """Remove lines first..last."""
+        self.edits.append((first, last, []))
+
+    def insert(self, after, lines):
+        """Insert lines after line number."""
+        self.edits.append((after + 1, after, lines))
+
+    def append(self, lines):
+        """Append lines to the end of file after all other edits."""
+        self.appended.extend(lines)
+
+    def write(self, encoding):
+        """Apply edits from the end of file and write it."""
+        # later inserts to the same place must be applied first
+        for first, last, _, lines in sorted(
+                ((first, last, i, lines) for i, (first, last, lines)
+                 in enumerate(self.edits)), reverse=True):
+            self.lines[first - 1:last] = lines
+        self.lines.extend(self.appended)
+        opener = COMPRESSED.get(splitext(self.path)[1].lower())
+        with replacing(self.path) as handle, \
+                open(handle, 'wb' if opener else 'w',
+                     encoding=None if opener else encoding) as file_:
+            if opener is None:
+                file_.writelines(self.lines)
+            else:
+                with opener(file_, 'wt', encoding=encoding) as text:
+                    text.writelines(self.lines)
+
+
+class _Writer():
+    """Edits of files from one write_back call."""
+
+    def __init__(self, parser, encoding, old, new):
+        self.parser = parser
+        self.encoding = encoding
+        self.old = old
+        self.new = new
+        self.known = parser.source_files or {}
+        self.headers = parser.section_sources or {}
+        self.files = {}
+
+    def file(self, source):
+        """Return _File for source, or None if it is not read file."""
+        path = abspath(fspath(source))
+        if path not in self.known:
+            return None             # string or dictionary source
+        if path not in self.files:
+            if fingerprint(path) != self.known[path]:
+                raise SourceChangedError(path)
+            self.files[path] = _File(path, self.encoding)
+        return self.files[path]
+
+    def remove_sections(self, removed):
+        """Remove all blocks of removed sections."""
+        for section in removed:
+            for source, header in self.headers.get(section, ()):
+                file_ = self.file(source)
+                if file_ is not None:
+                    file_.remove(header, file_.block_end(self.parser, header))
+
+    def change_options(self, changes, removed, added):
+        """Replace or remove changed options, new ones are set to added."""
+        sources = self.parser.option_sources or {}
+        for key in changes:
+            section, option = key
+            if section in removed:
+                continue
+            if key not in self.old:
+                added.setdefault(section, []).extend(
+                    _format(option, self.new[key]))
+                continue
+            positions = sources.get(key, ())
+            if key in self.new:
+                positions = positions[-1:]
+            for source, first, last in positions:
+                file_ = self.file(source)
+                if file_ is None:
+                    continue
+                if key in self.new:
+                    file_.replace(self.parser, first, last, self.new[key])
+                else:
+                    file_.remove(first, last)
+
+    def add_options(self, added):
+        """Add new options to last blocks of their sections.
+
+        Options of new sections are appended to the first read file after
+        all other edits, so they never precede options of existing section
+        at the end of file."""
+        root = next(iter(self.known), None)
+        for section, lines in added.items():
+            if section in self.headers:
+                source, header = self.headers[section][-1]
+                file_ = self.file(source)
+                if file_ is not None:
+                    file_.insert(file_.block_end(self.parser, header), lines)
+                    continue
+            if root is None:
+                raise ValueError("No file for new section %s" % section)
+            self.file(root).append(["\n", "[%s]\n" % section] + lines)
+
+    def write(self):
+        """Write edited files and return their list."""
+        for path, file_ in self.files.items():
+            file_.write(self.encoding)
+            self.known[path] = fingerprint(path)
+            log.info("Changes written to %s", path)
+            _retrack(self.parser, file_)
+        return list(self.files)
+
+
+def write_back(parser, encoding=None):
+    """Write changes from last read to source files.
+
+    Return list of rewritten files. SourceChangedError is raised if some of
+    files was changed after read, and ValueError if new section could not
+    be written because no file was read.
+    """
+    old = parser.source_values or {}
+    new = _values(parser)
+    changes = _changed(old, new)
+    sections = {section for section, _ in old}.union(
+        parser.section_sources or {})
+    removed = {section for section in sections
+               if section != parser.default_section
+               and not parser.has_section(section)}
+    added = {section: [] for section in parser.sections()
+             if section not in sections}
+    if not (changes or removed or added):
+        return []
+
+    writer = _Writer(parser, encoding, old, new)
+    writer.remove_sections(removed)
+    writer.change_options(changes, removed, added)
+    writer.add_options(added)
+    files = writer.write()
+    parser.source_values = new
+    return files
+
+
+def _retrack(parser, file_):
+    """Track positions of options and headers in rewritten file again.
+
+    Positions from other files are kept in their order."""
+    tracker = _Sources(parser)
+    tracker.sources, tracker.headers, tracker.paths = {}, {}, {}
+    for lineno, line in enumerate(file_.lines, 1):
+        if line.startswith('.include'):
+            tracker.section = tracker.option = None
+        else:
+            tracker.line(line, file_.path, lineno)
+
+    for sources, tracked in ((parser.option_sources, tracker.sources),
+                             (parser.section_sources, tracker.headers)):
+        for key in list(sources.keys() | tracked.keys()):
+            positions = sources.setdefault(key, [])
+            _replace(positions, file_.path, tracked.get(key, []))
+            if not positions:
+                del sources[key]
+
+    paths = parser.source_sections
+    for source in [source for source in paths
+                   if abspath(fspath(source)) == file_.path]:
+        del paths[source]
+    paths.update(tracker.paths)
+
+
+def _replace(positions, path, new):
+    """Replace positions in file with path by new positions."""
+    index = [i for i, position in enumerate(positions)
+             if abspath(fspath(position[0])) == path]
+    if not index:
+        positions.extend(new)
+        return
+    positions[index[0]:index[-1] + 1] = [
+        position for position in positions[index[0]:index[-1] + 1]
+        if abspath(fspath(position[0])) != path] + new
@@ -0,0 +1,131 @@
+"""Test for converters registry."""
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from ipaddress import ip_network, IPv4Network
+from unittest import TestCase
+
+from extendparser.convert import ByteSize, IntArray, FloatArray, \
+    NumberArray, compile_target, parse_duration, register
+from extendparser.get import Get
+
+# pylint: disable=missing-function-docstring
+
+
+class TestConvert(TestCase):
+    """Test built-in converters."""
+    cfp = Get()
+    cfp.read_dict({"test": {"size": "10 MB",
+                            "timeout": "1h 30m",
+                            "price": " 1.50 ",
+                            "created": "2020-01-02T03:04:05",
+                            "day": "2020-01-02",
+                            "limits": "read = 10; write=5",
+                            "network": "10.0.0.0/8",
+                            "ports": "80, 8000-8003, -2--1",
+                            "weights": "0.5; 1e-3",
+                            "true": "yes"}})
+
+    def test_size(self):
+        assert self.cfp.get_option("test", "size", target=ByteSize) == \
+            10000000
+        assert ByteSize("1KiB") == 1024
+        assert ByteSize("3") == 3
+        with self.assertRaises(ValueError):
+            ByteSize("1 XB")
+        assert ByteSize("9007199254740993") == 9007199254740993
+        assert ByteSize("1.25 KiB") == 1280
+        with self.assertRaises(ValueError):
+            ByteSize("1.7")
+        with self.assertRaises(ValueError):
+            ByteSize(1.7)
+
+    def test_duration(self):
+        assert self.cfp.get_option("test", "timeout", target=timedelta) == \
+            timedelta(hours=1, minutes=30)
+        assert parse_duration("250ms") == timedelta(milliseconds=250)
+        with self.assertRaises(ValueError):
+            parse_duration("1 hour")
+
+    def test_decimal(self):
+        assert self.cfp.get_option("test", "price", target=Decimal) == \
+            Decimal("1.50")
+
+    def test_datetime(self):
+        assert self.cfp.get_option("test", "created", target=datetime) == \
+            datetime(2020, 1, 2, 3, 4, 5)
+        assert self.cfp.get_option("test", "day", target=date) == \
+            date(2020, 1, 2)
+
+    def test_dict(self):
+        assert self.cfp.get_option(
+            "test", "limits", target=dict, delimiter=';') == \
+            {"read": "10", "write": "5"}
+
+    def test_network(self):
+        assert self.cfp.get_option("test", "network", target=ip_network) == \
+            IPv4Network("10.0.0.0/8")
+        assert self.cfp.get_option("test", "network", target=IPv4Network) \
+            == IPv4Network("10.0.0.0/8")
+
+    def test_int_array(self):
+        ports = self.cfp.get_option("test", "ports", target=IntArray)
+        assert isinstance(ports, IntArray)
+        assert ports.typecode == 'q'
+        assert ports.tolist() == [80, 8000, 8001, 8002, 8003, -2, -1]
+        assert IntArray([1, 2]).tolist() == [1, 2]
+        assert IntArray("-3--1").tolist() == [-3, -2, -1]
+        with self.assertRaises(ValueError):
+            IntArray("9000-8000")
+        assert not IntArray("")
+        with self.assertRaises(ValueError):
+            IntArray("1, x")
+
+    def test_float_array(self):
+        weights = self.cfp.get_option("test", "weights", target=FloatArray,
+                                      delimiter=';')
+        assert weights.tolist() == [0.5, 0.001]
+
+    def test_own_array(self):
+        class ShortArray(NumberArray):
+            """Array of short integers."""
+            TYPECODE = 'h'
+
+        register(ShortArray, ShortArray.factory)
+        cfp = Get()
+        cfp.read_dict({"test": {"values": "1:3"}})
+        assert cfp.get_option("test", "values", target=ShortArray,
+                              delimiter=':').tolist() == [1, 3]
+        cfp.set("test", "values", "1-3")
+        assert cfp.get_option("test", "values",
+                              target=ShortArray).itemsize == 2
+
+    def test_bool_subclass(self):
+        class Flag(int):
+            """Not bool subclass."""
+        with self.assertRaises(ValueError):
+            self.cfp.get_option("test", "true", target=Flag)
+        assert self.cfp.get_option("test", "true", target=bool) is True
+
+
+class TestRegistry(TestCase):
+    """Test registering of converters."""
+
+    def test_compiled(self):
+        assert compile_target(list, ';') is compile_target(list, ';')
+        assert compile_target(list, ';') is not compile_target(list, ',')
+
+        def target(value):
+            return value.upper()
+        assert compile_target(target)(None, " a ") == "A"
+        assert compile_target(target) is not compile_target(target)
+
+    def test_register(self):
+        class Pair(tuple):
+            """Pair of values."""
+
+        register(Pair, lambda delimiter: lambda parser, value:
+                 Pair(value.split(delimiter, 1)))
+        cfp = Get()
+        cfp.read_dict({"test": {"pair": "a:b:c"}})
+        assert cfp.get_option("test", "pair", target=Pair, delimiter=':') \
+            == ("a", "b:c")
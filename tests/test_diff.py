@@ -0,0 +1,67 @@
+"""Test for configuration differences."""
+from unittest import TestCase
+
+from extendparser import ExtendParser
+from extendparser.diff import ChangeNotifier, ConfigDiff, diff
+
+# pylint: disable=missing-function-docstring
+
+
+def parser(string):
+    """Return parser with sources tracking."""
+    cfp = ExtendParser()
+    cfp.track_sources = True
+    cfp.read_string(string, "test.ini")
+    return cfp
+
+
+class TestDiff(TestCase):
+    """Test diff function."""
+    old = parser("[DEFAULT]\nlevel = 1\n"
+                 "[db]\nhost = localhost\nport = 5432\n"
+                 "[old]\nkey = value\n")
+    new = parser("[DEFAULT]\nlevel = 2\n"
+                 "[db]\nhost = localhost\nport = 5433\nuser = test\n"
+                 "[new]\n")
+
+    def test_diff(self):
+        delta = diff(self.old, self.new)
+        assert delta.added_sections == {"new"}
+        assert delta.removed_sections == {"old"}
+        assert delta.added == {("db", "user"): "test"}
+        assert delta.removed == {("old", "key"): "value"}
+        assert delta.changed == {("db", "port"): ("5432", "5433"),
+                                 ("DEFAULT", "level"): ("1", "2")}
+        assert delta.sources == {("db", "user"): ("test.ini", 6, 6),
+                                 ("old", "key"): ("test.ini", 7, 7),
+                                 ("db", "port"): ("test.ini", 5, 5),
+                                 ("DEFAULT", "level"): ("test.ini", 2, 2)}
+
+    def test_equal(self):
+        assert not diff(self.old, self.old)
+
+    def test_sections(self):
+        delta = diff(self.old, self.new, {"db"})
+        assert delta.keys() == {("db", "user"), ("db", "port")}
+
+    def test_filter(self):
+        delta = diff(self.old, self.new).filter("db")
+        assert delta.keys() == {("db", "user"), ("db", "port")}
+        assert not delta.added_sections
+        delta = diff(self.old, self.new).filter(option="level")
+        assert delta.keys() == {("DEFAULT", "level")}
+
+
+class TestNotifier(TestCase):
+    """Test ChangeNotifier."""
+
+    def test_notify(self):
+        calls = []
+        notifier = ChangeNotifier()
+        notifier.subscribe(lambda delta: calls.append(("all", delta.keys())))
+        notifier.subscribe(lambda delta: calls.append(("db", delta.keys())),
+                           "db")
+        notifier.subscribe(lambda delta: calls.append(("app", delta.keys())),
+                           "app")
+        notifier.notify(ConfigDiff(changed={("db", "port"): ("1", "2")}))
+        assert calls == [("all", {("db", "port")}), ("db", {("db", "port")})]
@@ -162,3 +162,44 @@ class TestMixin(TestCase):
     def test_environment_last(self):
         """ConfigParser variables have accuracy."""
         assert self.last.get_option("test", "both", target=list) == ['5', '6']
+
+
+class TestSnapshot(TestCase):
+    """Test environment snapshot."""
+
+    class Mixin(EnvironFirst, Get):
+        """Testing mixin class."""
+        var_format = "SNAPSHOT_{section}_{option}"
+        environ_snapshot = True
+        cache_options = True
+
+    def tearDown(self):
+        environ.pop('SNAPSHOT_DB_PORT', None)
+
+    def test_refresh(self):
+        cfp = self.Mixin()
+        cfp.read_dict({"db": {"port": "1"}})
+        environ['SNAPSHOT_DB_PORT'] = '2'
+        assert cfp.get_option("db", "port", target=int) == 2
+
+        environ['SNAPSHOT_DB_PORT'] = '3'
+        assert cfp.get("db", "port") == '2'
+        assert cfp.get_option("db", "port", target=int) == 2
+
+        cfp.refresh_environ()
+        assert cfp.get("db", "port") == '3'
+        assert cfp.get_option("db", "port", target=int) == 3
+
+    def test_last(self):
+        class Mixin(EnvironLast, Get):
+            """Testing mixin class."""
+            var_format = "SNAPSHOT_{section}_{option}"
+            environ_snapshot = True
+
+        cfp = Mixin()
+        environ['SNAPSHOT_DB_PORT'] = '2'
+        assert cfp.get_option("db", "port", target=int) == 2
+        environ.pop('SNAPSHOT_DB_PORT')
+        assert cfp.get_option("db", "port", target=int) == 2
+        cfp.refresh_environ()
+        assert cfp.get_option("db", "port", target=int, fallback=1) == 1
@@ -0,0 +1,86 @@
+"""Test for FrozenParser."""
+from gc import collect
+from unittest import TestCase
+from weakref import ref
+from configparser import NoOptionError, NoSectionError
+
+from extendparser import ExtendParser
+from extendparser.frozen import FrozenParser, ReadOnlyParser
+
+# pylint: disable=missing-function-docstring
+
+
+class TestFrozen(TestCase):
+    """Test read-only parser."""
+
+    @classmethod
+    def setUpClass(cls):
+        cfp = ExtendParser(defaults={"host": "localhost"})
+        cfp.read_dict({"test": {"string": "value",
+                                "number": "42",
+                                "float": "3.14",
+                                "true": "on",
+                                "list": "a,b,c",
+                                "url": "http://%(host)s/"}})
+        cls.frozen = cfp.freeze()
+        cfp.set("test", "number", "1")
+
+    def test_instance(self):
+        assert isinstance(self.frozen, FrozenParser)
+        with self.assertRaises(AttributeError):
+            self.frozen.foo = 1
+        with self.assertRaises(TypeError):
+            ReadOnlyParser()    # pylint: disable=abstract-class-instantiated
+
+    def test_get(self):
+        assert self.frozen.get("test", "string") == "value"
+        assert self.frozen.get("test", "URL") == "http://localhost/"
+        assert self.frozen.get("test", "host") == "localhost"
+        assert self.frozen.get("DEFAULT", "host") == "localhost"
+        assert self.frozen.get("test", "none", fallback=None) is None
+
+    def test_conv(self):
+        assert self.frozen.getint("test", "number") == 42
+        assert self.frozen.getfloat("test", "float") == 3.14
+        assert self.frozen.getboolean("test", "true") is True
+        assert self.frozen.getint("test", "none", fallback=1) == 1
+
+    def test_not_found(self):
+        with self.assertRaises(NoSectionError):
+            self.frozen.get("none", "string")
+        with self.assertRaises(NoOptionError):
+            self.frozen.get("test", "none")
+
+    def test_get_option(self):
+        assert self.frozen.get_option("test", "true", target=bool) is True
+        assert self.frozen.get_option(
+            "test", "list", target=list) == ['a', 'b', 'c']
+        assert self.frozen.get_option(
+            "none", "list", target=list, fallback=[]) == []
+
+    def test_get_section(self):
+        assert self.frozen.get_section(
+            "test", ("string", ("number", int), ("none", int))) == \
+            {"string": "value", "number": 42}
+
+    def test_sections(self):
+        assert self.frozen.sections() == ["test"]
+        assert self.frozen.has_section("test")
+        assert self.frozen.has_option("test", "host")
+        assert not self.frozen.has_option("none", "host")
+        assert "host" in self.frozen.options("test")
+
+    def test_not_hold_parser(self):
+        cfp = ExtendParser()
+        cfp.read_dict({"test": {"Key": "value"}})
+        frozen, cfp = cfp.freeze(), ref(cfp)
+        collect()   # parser and its section proxies are in cycle
+        assert cfp() is None
+        assert frozen.get("test", "KEY") == "value"
+
+        cfp = ExtendParser()
+        cfp.optionxform = str
+        cfp.read_dict({"test": {"Key": "value"}})
+        frozen = cfp.freeze()
+        assert frozen.has_option("test", "Key")
+        assert not frozen.has_option("test", "key")
@@ -1,10 +1,12 @@
 """Test for Get extension."""
+from collections import namedtuple
 from unittest import TestCase
-from configparser import NoOptionError, NoSectionError
+from configparser import BasicInterpolation, NoOptionError, \
+    NoSectionError
 
 import logging
 
-from extendparser.get import Get
+from extendparser.get import Get, SectionSchema, FallbackLog
 
 LOG = []
 
@@ -95,6 +97,58 @@ class TestNotFound(TestCase):
         assert LOG.pop().startswith("[%s]::%s" % ("section", "option"))
 
 
+class TestFallbackLog(TestCase):
+    """Test aggregated logging of fallbacks."""
+
+    def setUp(self):
+        self.cfp = Get()
+        self.cfp.add_section("test")
+        self.cfp.fallback_log = FallbackLog()
+        LOG.clear()
+
+    def test_once(self):
+        for _ in range(5):
+            self.cfp.get_option("test", "number", target=int, fallback=1)
+            with self.assertRaises(NoOptionError):
+                self.cfp.get_option("test", "missing")
+        assert len(LOG) == 2
+        assert self.cfp.fallback_log.summary() == {
+            ("fallback", "test", "number"): 5,
+            ("missing", "test", "missing"): 5}
+
+    def test_mixed(self):
+        for _ in range(3):
+            self.cfp.get_option("test", "number", fallback=1)
+        with self.assertRaises(NoOptionError):
+            self.cfp.get_option("test", "number")
+        assert self.cfp.fallback_log.summary() == {
+            ("fallback", "test", "number"): 3,
+            ("missing", "test", "number"): 1}
+        assert len(LOG) == 2
+
+    def test_report(self):
+        for _ in range(3):
+            self.cfp.get_option("test", "number", fallback=1)
+        LOG.clear()
+        self.cfp.fallback_log.report()
+        assert LOG == ["Fallback value for [test]::number was used 3 times"]
+        self.cfp.fallback_log.report()
+        assert len(LOG) == 1
+        assert self.cfp.fallback_log.summary() == {
+            ("fallback", "test", "number"): 3}
+
+    def test_interval(self):
+        self.cfp.fallback_log.interval = 0
+        self.cfp.get_option("test", "number", fallback=1)
+        assert LOG[-1] == "Fallback value for [test]::number was used 1 times"
+
+    def test_clear(self):
+        self.cfp.get_option("test", "number", fallback=1)
+        self.cfp.fallback_log.clear()
+        self.cfp.get_option("test", "number", fallback=1)
+        assert len(LOG) == 2
+
+
 class TestSection(TestCase):
     """Test getting full section."""
     cfp = Get()
@@ -124,3 +178,172 @@ class TestSection(TestCase):
             self.cfp.get_section("new", (("string", str, "value"),
                                          ("bool", bool, False),
                                          ("number")), False)
+
+
+class TestCache(TestCase):
+    """Test cache of converted values."""
+
+    def setUp(self):
+        self.cfp = Get()
+        self.cfp.cache_options = True
+        self.cfp.read_dict({"test": {"number": "42", "list": "a,b"}})
+
+    def test_hits(self):
+        for _ in range(3):
+            assert self.cfp.get_option("test", "number", target=int) == 42
+        assert (self.cfp.cache_hits, self.cfp.cache_misses) == (2, 1)
+
+    def test_key(self):
+        assert self.cfp.get_option("test", "number") == "42"
+        assert self.cfp.get_option("test", "number", target=int) == 42
+        assert self.cfp.get_option(
+            "test", "list", target=list) == ['a', 'b']
+        assert self.cfp.get_option(
+            "test", "list", target=list, delimiter=';') == ['a,b']
+        assert self.cfp.cache_misses == 4
+
+    def test_set(self):
+        assert self.cfp.get_option("test", "number", target=int) == 42
+        self.cfp.set("test", "number", "7")
+        assert self.cfp.get_option("test", "number", target=int) == 7
+
+    def test_remove(self):
+        assert self.cfp.get_option("test", "number", target=int) == 42
+        self.cfp.remove_option("test", "number")
+        assert self.cfp.get_option(
+            "test", "number", target=int, fallback=1) == 1
+        LOG.pop()
+        self.cfp.remove_section("test")
+        with self.assertRaises(NoSectionError):
+            self.cfp.get_option("test", "list")
+        LOG.pop()
+
+    def test_read(self):
+        assert self.cfp.get_option("test", "number", target=int) == 42
+        self.cfp.read_string("[test]\nnumber = 1")
+        assert self.cfp.get_option("test", "number", target=int) == 1
+        self.cfp.read_dict({"test": {"number": "2"}})
+        assert self.cfp.get_option("test", "number", target=int) == 2
+        self.cfp["test"]["number"] = "3"
+        assert self.cfp.get_option("test", "number", target=int) == 3
+
+    def test_read_during_change(self):
+        class Reader(BasicInterpolation):
+            """Interpolation, which reads value while it is being set."""
+            def before_set(self, parser, section, option, value):
+                parser.get_option(section, option, target=int, fallback=0)
+                return value
+
+        cfp = Get(interpolation=Reader())
+        cfp.cache_options = True
+        cfp.read_dict({"test": {"number": "42"}})
+        cfp.set("test", "number", "7")
+        assert cfp.get_option("test", "number", target=int) == 7
+        LOG.clear()
+
+    def test_disabled(self):
+        cfp = Get()
+        cfp.read_dict({"test": {"number": "42"}})
+        assert cfp.get_option("test", "number", target=int) == 42
+        assert (cfp.cache_hits, cfp.cache_misses) == (0, 0)
+
+
+class TestSchema(TestCase):
+    """Test compiled section schema."""
+    cfp = Get()
+    cfp.add_section("test")
+    cfp.set("test", "string", "value")
+    cfp.set("test", "number", "1")
+    cfp.set("test", "bool", "on")
+    cfp.set("test", "list", "1;2")
+
+    schema = SectionSchema(("string", ("bool", bool),
+                            ("list", list, [], ';'),
+                            ("missing", int, 0),
+                            ("none", int)))
+
+    def test_dict(self):
+        kwargs = self.cfp.get_section("test", self.schema)
+        assert kwargs == {"string": "value", "bool": True, "list": ['1', '2'],
+                          "missing": 0}
+        LOG.clear()
+
+    def test_not_skip(self):
+        with self.assertRaises(NoOptionError):
+            self.cfp.get_section("test", self.schema, False)
+        LOG.clear()
+
+    def test_factory(self):
+        class Settings:
+            """Settings object."""
+            __slots__ = ("string", "number")
+
+            def __init__(self, string, number):
+                self.string = string
+                self.number = number
+
+        schema = SectionSchema(("string", ("number", int)), Settings)
+        settings = schema.extract(self.cfp, "test")
+        assert (settings.string, settings.number) == ("value", 1)
+
+    def test_factory_missing(self):
+        settings = namedtuple("Settings", ("string", "none"))
+        with self.assertRaises(NoOptionError) as err:
+            SectionSchema(("string", ("none", int)), settings).extract(
+                self.cfp, "test")
+        assert err.exception.option == "none"
+
+        settings = namedtuple("Settings", ("string", "none"),
+                              defaults=(None, ))
+        assert SectionSchema(("string", ("none", int)), settings).extract(
+            self.cfp, "test") == ("value", None)
+        LOG.clear()
+
+    def test_cache(self):
+        cfp = Get()
+        cfp.cache_options = True
+        cfp.read_dict({"test": {"number": "1"}})
+        schema = SectionSchema((("number", int),))
+        assert cfp.get_section("test", schema) == {"number": 1}
+        assert cfp.get_option("test", "number", target=int) == 1
+        assert (cfp.cache_hits, cfp.cache_misses) == (1, 1)
+
+
+class TestSnapshot(TestCase):
+    """Test snapshot of more sections."""
+    cfp = Get()
+    cfp.read_dict({"db": {"host": "localhost", "port": "5432"},
+                   "app": {"debug": "on"}})
+
+    def test_mapping(self):
+        config = self.cfp.snapshot({"db": ("host", ("port", int)),
+                                    "app": (("debug", bool),
+                                            ("workers", int, 4))})
+        assert config["db"] == {"host": "localhost", "port": 5432}
+        assert config["app"] == {"debug": True, "workers": 4}
+        LOG.pop()
+        with self.assertRaises(TypeError):
+            config["db"]["port"] = 1
+
+    def test_factory(self):
+        app = namedtuple("App", ("debug", ))
+        config = self.cfp.snapshot(
+            {"app": SectionSchema((("debug", bool),), app)},
+            namedtuple("Config", ("app", )))
+        assert config.app.debug is True
+
+    def test_one_pass(self):
+        cfp = Get()
+        cfp.read_string("[DEFAULT]\nhost = localhost\n"
+                        "[db]\nurl = http://%(host)s/\nPort = 1\n")
+        schema = {"db": ("url", ("port", int), "host",
+                         ("timeout", int, 5)),
+                  "none": (("key", str, "value"), )}
+        config = cfp.snapshot(schema)
+        assert config["db"] == cfp.get_section("db", schema["db"])
+        assert config["db"] == {"url": "http://localhost/", "port": 1,
+                                "host": "localhost", "timeout": 5}
+        assert config["none"] == {"key": "value"}
+        with self.assertRaises(NoSectionError):
+            cfp.snapshot({"none": ("key", )}, skip=False)
+        LOG.clear()
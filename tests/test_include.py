@@ -1,8 +1,18 @@
 """Test Include extension."""
-from os import path, chdir, getcwd
+import asyncio
+import bz2
+import gzip
+import lzma
+
+from concurrent.futures import ThreadPoolExecutor
+from os import path, chdir, getcwd, listdir, mkdir
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from configparser import DuplicateSectionError, ParsingError
 
-from extendparser.include import Include
+from extendparser.include import Include, FragmentCache, \
+    IncludeCycleError, expand_include, open_file
+from extendparser.stats import Instrument
 
 PWD = getcwd()
 TEST_PATH = path.dirname(__file__)              # noqa
@@ -31,3 +41,487 @@ class TestInclude(TestCase):
 
     def test_include_order(self):
         assert self.cfp.get("main", "key") == "value"
+
+
+class TestFragmentCache(TestCase):
+    """Test reading includes through fragment cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        chdir(path.join(TEST_PATH, path.pardir))
+
+    @classmethod
+    def tearDownClass(cls):
+        chdir(PWD)
+
+    def test_read(self):
+        cache = FragmentCache()
+        for _ in range(3):
+            cfp = Include()
+            cfp.fragment_cache = cache
+            assert cfp.read("tests/data/test.ini") == ["tests/data/test.ini"]
+            assert cfp.get("main", "foo") == "bar"
+            assert cfp.get("sec", "key") == "include2 value"
+            assert cfp.get("main", "key") == "value"
+        assert (cache.misses, cache.hits) == (3, 6)
+        assert cache.parses == 5
+
+    def test_parse_once(self):
+        cache = FragmentCache()
+        with TemporaryDirectory() as tmp:
+            common = path.join(tmp, "common.ini")
+            with open(common, "w", encoding="utf-8") as file_:
+                file_.write("[common]\nKey = value\n\tnext line\n")
+            main = path.join(tmp, "main.ini")
+            with open(main, "w", encoding="utf-8") as file_:
+                file_.write("[main]\nkey = 1\n.include %s\n"
+                            "[main]\nother = 2\n.include %s\n"
+                            % (common, common))
+            for _ in range(2):
+                cfp = Include()
+                cfp.fragment_cache = cache
+                cfp.read(main)
+                assert cfp.items("main") == [("key", "1"), ("other", "2")]
+                assert cfp.get("common", "key") == "value\nnext line"
+            assert cache.parses == 4
+
+            cfp = Include()
+            cfp.optionxform = str
+            cfp.fragment_cache = cache
+            cfp.read(main)
+            assert cfp.options("common") == ["Key"]
+            assert cache.parses == 8
+
+    def test_not_exists(self):
+        cfp = Include()
+        cfp.fragment_cache = FragmentCache()
+        cfp.read("tests/data/none.ini")
+        assert not cfp.sections()
+
+    def test_changed(self):
+        cache = FragmentCache()
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, "test.ini")
+            for value in ("1", "22"):
+                with open(filename, "w", encoding="utf-8") as file_:
+                    file_.write("[main]\nkey = %s\n" % value)
+                cfp = Include()
+                cfp.fragment_cache = cache
+                cfp.read(filename)
+                assert cfp.get("main", "key") == value
+        assert cache.misses == 2
+
+
+class TestStream(TestCase):
+    """Test reading includes as one stream."""
+
+    @classmethod
+    def setUpClass(cls):
+        chdir(path.join(TEST_PATH, path.pardir))
+
+    @classmethod
+    def tearDownClass(cls):
+        chdir(PWD)
+
+    def test_read(self):
+        for cache in (None, FragmentCache()):
+            with self.subTest(cache=cache):
+                cfp = Include(strict=False)
+                cfp.include_stream = True
+                cfp.fragment_cache = cache
+                cfp.read("tests/data/test.ini")
+                assert cfp.get("main", "foo") == "bar"
+                assert cfp.get("sec", "key") == "include2 value"
+                assert cfp.get("main", "key") == "value"
+
+    def test_duplicate_section(self):
+        cfp = Include()
+        cfp.include_stream = True
+        with self.assertRaises(DuplicateSectionError) as err:
+            cfp.read("tests/data/test.ini")
+        assert err.exception.source == "tests/data/include2.ini"
+        assert err.exception.lineno == 2
+
+    def test_section_continue(self):
+        with TemporaryDirectory() as tmp:
+            include = path.join(tmp, "include.ini")
+            with open(include, "w", encoding="utf-8") as file_:
+                file_.write("foo = bar\n")
+            cfp = Include()
+            cfp.include_stream = True
+            cfp.read_string("[main]\n.include %s\nkey = value\n" % include)
+        assert dict(cfp["main"]) == {"foo": "bar", "key": "value"}
+
+    def test_parsing_error(self):
+        with TemporaryDirectory() as tmp:
+            include = path.join(tmp, "include.ini")
+            with open(include, "w", encoding="utf-8") as file_:
+                file_.write("[sec]\nkey = value\nerror\n")
+            cfp = Include()
+            cfp.include_stream = True
+            with self.assertRaises(ParsingError) as err:
+                cfp.read_string("[main]\n\n.include %s\nerror\n" % include,
+                                "main.ini")
+        assert err.exception.source == include
+        assert err.exception.errors == [
+            (3, "'error\\n'"), (4, "main.ini: 'error\\n'")]
+
+
+def write_files(tmp, files):
+    """Write files to tmp directory and return dictionary of their paths."""
+    paths = {}
+    for name, content in files.items():
+        paths[name] = path.join(tmp, name)
+        with open(paths[name], "w", encoding="utf-8") as file_:
+            file_.write(content.format(tmp=tmp))
+    return paths
+
+
+class TestGraph(TestCase):
+    """Test include graph."""
+
+    def test_graph(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "main.ini": ".include {tmp}/a.ini\n.include {tmp}/b.ini\n"
+                            ".include {tmp}/none.ini\n",
+                "a.ini": "[a]\nkey = a\n.include {tmp}/c.ini\n",
+                "b.ini": "[b]\nkey = b\n.include {tmp}/c.ini\n",
+                "c.ini": "[c]\nkey = c\n"})
+            for stream in (False, True):
+                with self.subTest(stream=stream):
+                    cfp = Include(strict=False)
+                    cfp.include_stream = stream
+                    cfp.read(paths["main.ini"])
+                    graph = cfp.include_graph
+                    assert graph.order == [
+                        paths["main.ini"], paths["a.ini"], paths["c.ini"],
+                        paths["b.ini"], paths["c.ini"]]
+                    assert graph.edges == [
+                        (paths["main.ini"], paths["a.ini"]),
+                        (paths["main.ini"], paths["b.ini"]),
+                        (paths["main.ini"], path.join(tmp, "none.ini")),
+                        (paths["a.ini"], paths["c.ini"]),
+                        (paths["b.ini"], paths["c.ini"])]
+                    assert graph.missing == [path.join(tmp, "none.ini")]
+                    assert not graph.timed and not graph.times
+
+                    cfp = Include(strict=False)
+                    cfp.include_stream = stream
+                    cfp.instrument = Instrument()
+                    cfp.read(paths["main.ini"])
+                    graph = cfp.include_graph
+                    assert set(graph.times) == set(graph.nodes)
+
+                    cfp = Include(strict=False)
+                    cfp.include_stream = stream
+                    cfp.include_timed = True
+                    cfp.read(paths["main.ini"])
+                    graph = cfp.include_graph
+                    assert graph.timed and set(graph.times) == set(graph.nodes)
+
+    def test_once(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "main.ini": "[main]\n.include {tmp}/a.ini\n"
+                            ".include {tmp}/a.ini\n",
+                "a.ini": "key = a\n"})
+            cfp = Include()
+            cfp.include_stream = True
+            cfp.include_once = True
+            cfp.read(paths["main.ini"])
+            assert cfp.include_graph.order == [
+                paths["main.ini"], paths["a.ini"]]
+            assert cfp.get("main", "key") == "a"
+
+    def test_cycle(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "a.ini": "[a]\n.include {tmp}/b.ini\n",
+                "b.ini": "[b]\n.include {tmp}/a.ini\n"})
+            for stream in (False, True):
+                with self.subTest(stream=stream):
+                    cfp = Include()
+                    cfp.include_stream = stream
+                    with self.assertRaises(IncludeCycleError) as err:
+                        cfp.read(paths["a.ini"])
+                    assert err.exception.chain == [
+                        paths["a.ini"], paths["b.ini"], paths["a.ini"]]
+
+
+class TestReadCached(TestCase):
+    """Test binary cache of parsed files."""
+
+    def test_cache(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "main.ini": "[main]\nkey = value\n.include {tmp}/a.ini\n",
+                "a.ini": "[a]\nkey = a\n"})
+            cache_file = path.join(tmp, "cache.bin")
+
+            cfp = Include()
+            assert cfp.read_cached(paths["main.ini"], cache_file) == \
+                [paths["main.ini"]]
+            assert path.exists(cache_file)
+
+            cfp = Include()
+            cfp.read = None     # read method must not be called
+            assert cfp.read_cached(paths["main.ini"], cache_file) == \
+                [paths["main.ini"]]
+            assert cfp.get("main", "key") == "value"
+            assert cfp.get("a", "key") == "a"
+
+            write_files(tmp, {"a.ini": "[a]\nkey = changed\n"})
+            cfp = Include()
+            cfp.read_cached(paths["main.ini"], cache_file)
+            assert cfp.get("a", "key") == "changed"
+
+    def test_settings(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {"main.ini": "[Main]\nKey = value\n"})
+            cache_file = path.join(tmp, "cache.bin")
+            cfp = Include()
+            cfp.optionxform = str
+            cfp.read_cached(paths["main.ini"], cache_file)
+            assert cfp.has_option("Main", "Key")
+
+            cfp = Include()
+            cfp.read_cached(paths["main.ini"], cache_file)
+            assert cfp.has_option("Main", "key")
+
+            cfp = Include(comment_prefixes=('#', ))
+            cfp.read = None     # read method must not be called
+            with self.assertRaises(TypeError):
+                cfp.read_cached(paths["main.ini"], cache_file)
+
+    def test_missing(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "main.ini": "[main]\n.include {tmp}/a.ini\n"})
+            cache_file = path.join(tmp, "cache.bin")
+            Include().read_cached(paths["main.ini"], cache_file)
+
+            write_files(tmp, {"a.ini": "key = a\n"})
+            cfp = Include()
+            cfp.include_stream = True
+            cfp.read_cached(paths["main.ini"], cache_file)
+            assert cfp.get("main", "key") == "a"
+
+    def test_invalid(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {"main.ini": "[main]\nkey = value\n",
+                                      "cache.bin": "invalid"})
+            cfp = Include()
+            cfp.read_cached(paths["main.ini"], paths["cache.bin"])
+            assert cfp.get("main", "key") == "value"
+
+    def test_not_writable(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {"main.ini": "[main]\nkey = value\n"})
+            cfp = Include()
+            with self.assertLogs("extendparser", "WARNING"):
+                assert cfp.read_cached(
+                    paths["main.ini"], path.join(tmp, "none", "cache.bin")) \
+                    == [paths["main.ini"]]
+            assert cfp.get("main", "key") == "value"
+
+    def test_concurrent_writes(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {"main.ini": "[main]\nkey = value\n"})
+            cache_file = path.join(tmp, "cache.bin")
+
+            def read(count):
+                # other file lists, so each thread writes the cache again
+                for _ in range(20):
+                    cfp = Include()
+                    cfp.read_cached([paths["main.ini"]] * count, cache_file)
+                    assert cfp.get("main", "key") == "value"
+
+            with ThreadPoolExecutor(8) as executor:
+                for future in [executor.submit(read, count)
+                               for count in range(1, 9)]:
+                    future.result()
+            assert sorted(listdir(tmp)) == ["cache.bin", "main.ini"]
+
+
+class TestSources(TestCase):
+    """Test tracking of options sources."""
+
+    def test_sources(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, {
+                "main.ini": "# main\n[main]\nkey = value\n  next line\n"
+                            ".include {tmp}/a.ini\n\n[sec]\nfoo: bar\n",
+                "a.ini": "[a]\n; comment\nkey = a\n[main]\nkey = a\n"})
+            for stream in (False, True):
+                with self.subTest(stream=stream):
+                    cfp = Include(strict=False)
+                    cfp.include_stream = stream
+                    cfp.track_sources = True
+                    cfp.read(paths["main.ini"])
+                    assert cfp.option_sources == {
+                        ("main", "key"): [(paths["main.ini"], 3, 4),
+                                          (paths["a.ini"], 5, 5)],
+                        ("a", "key"): [(paths["a.ini"], 3, 3)],
+                        ("sec", "foo"): [(paths["main.ini"], 8, 8)]}
+                    assert cfp.source_sections == {
+                        paths["main.ini"]: {"main", "sec"},
+                        paths["a.ini"]: {"a", "main"}}
+
+
+class TestConcurrent(TestCase):
+    """Test reading files by threads."""
+
+    files = {
+        "main.ini": "[main]\nkey = main\n.include {tmp}/a.ini\n"
+                    ".include {tmp}/b.ini\n.include {tmp}/none.ini\n",
+        "a.ini": "[a]\nkey = a\n.include {tmp}/c.ini\n",
+        "b.ini": "[main]\nkey = b\n.include {tmp}/c.ini\n",
+        "c.ini": "[c]\nkey = c\n"}
+
+    def check(self, cfp, paths):
+        assert cfp.get("main", "key") == "b"
+        assert cfp.get("a", "key") == "a"
+        assert cfp.get("c", "key") == "c"
+        assert cfp.include_graph.order == [
+            paths["main.ini"], paths["a.ini"], paths["c.ini"],
+            paths["b.ini"], paths["c.ini"]]
+        assert cfp.fragment_cache is None
+
+    def test_threads(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, self.files)
+            cfp = Include()
+            assert cfp.read_concurrent(paths["main.ini"], max_workers=4) == \
+                [paths["main.ini"]]
+            self.check(cfp, paths)
+
+    def test_asyncio(self):
+        with TemporaryDirectory() as tmp:
+            paths = write_files(tmp, self.files)
+            cfp = Include()
+            assert asyncio.run(cfp.aread(paths["main.ini"])) == \
+                [paths["main.ini"]]
+            self.check(cfp, paths)
+
+
+class TestDirectory(TestCase):
+    """Test glob and directory includes."""
+
+    files = {
+        "main.ini": "[main]\nkey = main\n.include {tmp}/conf.d/*.ini\n"
+                    "[last]\n.include {tmp}/conf.d\n",
+        "conf.d/20-b.ini": "[b]\nkey = b\n",
+        "conf.d/10-a.ini": "[a]\nkey = a\n",
+        "conf.d/30-c.txt": "[c]\nkey = c\n",
+        "conf.d/.hidden.ini": "[hidden]\nkey = hidden\n"}
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        mkdir(path.join(self.tmp.name, "conf.d"))
+        self.paths = write_files(self.tmp.name, self.files)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, cfp):
+        paths = self.paths
+        assert cfp.sections() == ["main", "a", "b", "last", "c"]
+        assert "hidden" not in cfp
+        assert cfp.include_graph.order == [
+            paths["main.ini"], paths["conf.d/10-a.ini"],
+            paths["conf.d/20-b.ini"], paths["conf.d/10-a.ini"],
+            paths["conf.d/20-b.ini"], paths["conf.d/30-c.txt"]]
+        assert cfp.include_graph.directories == \
+            [path.join(self.tmp.name, "conf.d")] * 2
+
+    def test_expand(self):
+        conf = path.join(self.tmp.name, "conf.d")
+        assert expand_include(path.join(conf, "*.ini")) == (
+            self.paths["conf.d/10-a.ini"], self.paths["conf.d/20-b.ini"])
+        assert expand_include(path.join(conf, "none.ini")) == \
+            (path.join(conf, "none.ini"), )
+        assert expand_include(path.join(self.tmp.name, "none", "*")) == ()
+        assert expand_include(path.join(self.tmp.name, "*", "2*")) == \
+            (self.paths["conf.d/20-b.ini"], )
+        chdir(conf)
+        try:
+            assert expand_include("1*") == ("10-a.ini", )
+        finally:
+            chdir(PWD)
+
+    def test_segments(self):
+        cfp = Include(strict=False)
+        cfp.read(self.paths["main.ini"])
+        self.check(cfp)
+
+    def test_stream(self):
+        cfp = Include(strict=False)
+        cfp.include_stream = True
+        cfp.read(self.paths["main.ini"])
+        self.check(cfp)
+
+    def test_fragment_cache(self):
+        cfp = Include(strict=False)
+        cfp.fragment_cache = FragmentCache()
+        cfp.read(self.paths["main.ini"])
+        self.check(cfp)
+        hits = cfp.fragment_cache.hits
+        cfp.read(self.paths["main.ini"])
+        assert cfp.fragment_cache.hits == hits + 8   # 6 files, 2 listings
+
+    def test_concurrent(self):
+        cfp = Include(strict=False)
+        cfp.read_concurrent(self.paths["main.ini"])
+        self.check(cfp)
+
+    def test_cached(self):
+        cache_file = path.join(self.tmp.name, "cache.bin")
+        Include(strict=False).read_cached(self.paths["main.ini"], cache_file)
+        write_files(self.tmp.name, {"conf.d/40-d.ini": "[d]\nkey = d\n"})
+        cfp = Include(strict=False)
+        cfp.read_cached(self.paths["main.ini"], cache_file)
+        assert cfp.get("d", "key") == "d"
+
+
+class TestCompressed(TestCase):
+    """Test reading of compressed files."""
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        self.main = path.join(self.tmp.name, "main.ini.gz")
+        with gzip.open(self.main, "wt", encoding="utf-8") as file_:
+            file_.write("[main]\nkey = main\n.include %s/b.ini.bz2\n"
+                        ".include %s/c.ini.xz\n" % ((self.tmp.name,) * 2))
+        with bz2.open(path.join(self.tmp.name, "b.ini.bz2"), "wt",
+                      encoding="utf-8") as file_:
+            file_.write("[b]\nkey = b\n")
+        with lzma.open(path.join(self.tmp.name, "c.ini.xz"), "wt",
+                       encoding="utf-8") as file_:
+            file_.write("[c]\nkey = č\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, cfp):
+        assert cfp.sections() == ["main", "b", "c"]
+        assert cfp.get("c", "key") == "č"
+
+    def test_open_file(self):
+        with open_file(self.main, "utf-8") as file_:
+            assert file_.readline() == "[main]\n"
+
+    def test_modes(self):
+        for stream in (False, True):
+            for cache in (None, FragmentCache()):
+                with self.subTest(stream=stream, cache=cache):
+                    cfp = Include()
+                    cfp.include_stream = stream
+                    cfp.fragment_cache = cache
+                    cfp.read(self.main, encoding="utf-8")
+                    self.check(cfp)
+
+    def test_concurrent(self):
+        cfp = Include()
+        cfp.read_concurrent(self.main, encoding="utf-8")
+        self.check(cfp)
@@ -0,0 +1,84 @@
+"""Test for CachedInterpolation."""
+from unittest import TestCase
+from configparser import ExtendedInterpolation
+
+from extendparser.get import Get
+from extendparser.interpolation import CachedInterpolation
+
+# pylint: disable=missing-function-docstring
+
+
+class TestBasic(TestCase):
+    """Test cache of basic interpolation."""
+
+    def setUp(self):
+        self.interpolation = CachedInterpolation()
+        self.cfp = Get(interpolation=self.interpolation,
+                       defaults={"scheme": "http"})
+        self.cfp.read_string(
+            "[main]\n"
+            "host = localhost\n"
+            "port = 80\n"
+            "address = %(host)s:%(port)s\n"
+            "url = %(scheme)s://%(address)s/\n"
+            "name = test\n")
+
+    def test_cache(self):
+        for _ in range(3):
+            assert self.cfp.get("main", "url") == "http://localhost:80/"
+        assert (self.interpolation.hits, self.interpolation.misses) == (2, 1)
+
+    def test_set(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        assert self.cfp.get("main", "name") == "test"
+        self.cfp.set("main", "port", "8080")
+        assert self.cfp.get("main", "name") == "test"
+        assert self.interpolation.hits == 1
+        assert self.cfp.get("main", "url") == "http://localhost:8080/"
+
+    def test_set_empty(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        self.cfp.set("main", "host", "")
+        assert self.cfp.get("main", "url") == "http://:80/"
+
+    def test_default(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        self.cfp.set("DEFAULT", "scheme", "https")
+        assert self.cfp.get("main", "url") == "https://localhost:80/"
+        self.cfp.set("main", "scheme", "ftp")
+        assert self.cfp.get("main", "url") == "ftp://localhost:80/"
+
+    def test_remove(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        self.cfp.remove_option("main", "port")
+        self.cfp.set("DEFAULT", "port", "81")
+        assert self.cfp.get("main", "url") == "http://localhost:81/"
+
+    def test_read(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        self.cfp.read_string("[main]\nhost = example.net\n")
+        assert self.cfp.get("main", "url") == "http://example.net:80/"
+        self.cfp["main"] = {"url": "%(scheme)s://%(host)s/", "host": "a"}
+        assert self.cfp.get("main", "url") == "http://a/"
+
+    def test_vars(self):
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+        assert self.cfp.get("main", "url", vars={"port": "1"}) == \
+            "http://localhost:1/"
+        assert self.cfp.get("main", "url") == "http://localhost:80/"
+
+
+class TestExtended(TestCase):
+    """Test cache of extended interpolation."""
+
+    def test_sections(self):
+        cfp = Get(interpolation=CachedInterpolation(ExtendedInterpolation()))
+        cfp.read_string(
+            "[db]\n"
+            "host = localhost\n"
+            "url = postgres://${host}/\n"
+            "[app]\n"
+            "db = ${db:url}\n")
+        assert cfp.get("app", "db") == "postgres://localhost/"
+        cfp.set("db", "host", "example.net")
+        assert cfp.get("app", "db") == "postgres://example.net/"
@@ -0,0 +1,133 @@
+"""Test for layered configuration."""
+from os import environ, path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from configparser import NoSectionError, NoOptionError
+
+from extendparser import ExtendParser
+from extendparser.layers import LayeredConfig, DictLayer, FileLayer, \
+    EnvironLayer, OverrideLayer
+
+# pylint: disable=missing-function-docstring
+
+
+class TestLayers(TestCase):
+    """Test merging of layers."""
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        self.main = path.join(self.tmp.name, "main.ini")
+        self.write("[DEFAULT]\nlevel = 1\n[db]\nhost = db.local\n"
+                   "url = postgres://%(host)s/\n")
+        environ["LAYERS_PORT"] = "5433"
+        self.config = LayeredConfig((
+            DictLayer("defaults", {"db": {"Host": "localhost",
+                                          "port": "5432"},
+                                   "log": {"level": "info"}}),
+            FileLayer("files", self.main, ExtendParser),
+            EnvironLayer("environ", var_format="LAYERS_{option}"),
+            OverrideLayer("cli", ["log.level = debug"])))
+
+    def tearDown(self):
+        environ.pop("LAYERS_PORT", None)
+        self.tmp.cleanup()
+
+    def write(self, content):
+        with open(self.main, "w", encoding="utf-8") as file_:
+            file_.write(content)
+
+    def test_get(self):
+        config = self.config
+        assert config.sections() == ["db", "log"]
+        assert config.get("db", "host") == "db.local"
+        assert config.get("db", "HOST") == "db.local"
+        assert config.get("db", "url") == "postgres://db.local/"
+        assert config.get_option("db", "port", target=int) == 5433
+        assert config.get("log", "level") == "debug"
+        assert config.get("db", "level") == "1"
+        assert config.get_section("db", ("host", ("port", int))) == \
+            {"host": "db.local", "port": 5433}
+        with self.assertRaises(NoSectionError):
+            config.get("none", "key")
+        with self.assertRaises(NoOptionError):
+            config.get("db", "none")
+        assert config.get("db", "none", fallback=None) is None
+
+    def test_source(self):
+        config = self.config
+        assert config.source("db", "host") == "files"
+        assert config.source("db", "port") == "environ"
+        assert config.source("log", "level") == "cli"
+        assert config.source("db", "level") == "files"
+        assert config.has_option("db", "level")
+        assert not config.has_option("none", "level")
+        assert dict(config.items("db")) == {
+            "host": "db.local", "port": "5433",
+            "url": "postgres://db.local/", "level": "1"}
+
+    def test_update(self):
+        self.write("[db]\nhost = other\n[new]\nkey = value\n")
+        environ["LAYERS_KEY"] = "env"
+        self.config.update("files")
+        assert self.config.get("db", "host") == "other"
+        assert self.config.get("new", "key") == "env"
+        assert not self.config.has_option("db", "url")
+        self.config.layer("defaults").mapping["log"]["format"] = "short"
+        environ.pop("LAYERS_PORT")
+        self.config.update("defaults")
+        assert self.config.get("log", "format") == "short"
+        assert self.config.get("db", "port") == "5432"
+        environ.pop("LAYERS_KEY")
+
+    def test_environ_keys(self):
+        environ["LAYERS_SECRET"] = "secret"
+        try:
+            config = LayeredConfig((EnvironLayer(
+                "environ", (("db", "secret"), ), "LAYERS_{option}"), ))
+        finally:
+            environ.pop("LAYERS_SECRET")
+        assert config.get("db", "secret") == "secret"
+
+    def test_override(self):
+        self.config.override("db", "Port", "1")
+        assert self.config.get("db", "port") == "1"
+        assert self.config.source("db", "port") == "cli"
+        self.config.override("db", "port", 2)
+        assert self.config.get_option("db", "port", target=int) == 2
+        config = LayeredConfig((DictLayer("defaults"), ))
+        with self.assertRaises(ValueError):
+            config.override("db", "port", "1")
+
+    def test_override_new(self):
+        config = LayeredConfig((
+            DictLayer("defaults", {"a": {"key": "1"}}),
+            OverrideLayer("cli"),
+            EnvironLayer("env", var_format="LAYERS_{section}_{option}")))
+        environ["LAYERS_A_NEW"] = "envnew"
+        try:
+            config.override("a", "new", "cli")
+        finally:
+            environ.pop("LAYERS_A_NEW")
+        assert config.get("a", "new") == "envnew"
+        assert config.source("a", "new") == "env"
+        config.override("a", "other", "cli")
+        assert config.source("a", "other") == "cli"
+
+    def test_not_string(self):
+        config = LayeredConfig((DictLayer("defaults", {
+            "net": {"timeout": 10, "debug": True, "flag": None}}), ))
+        assert config.get_option("net", "timeout", target=int) == 10
+        assert config.get("net", "debug") == "True"
+        assert config.get("net", "flag") is None
+
+    def test_add_remove(self):
+        self.config.add_layer(DictLayer("low", {"db": {"host": "low"},
+                                                "extra": {"key": "1"}}), 0)
+        assert self.config.get("extra", "key") == "1"
+        assert self.config.source("db", "host") == "files"
+        self.config.remove_layer("files")
+        assert self.config.get("db", "host") == "localhost"
+        assert "url" not in self.config.options("db")
+        self.config.remove_layer("low")
+        assert not self.config.has_section("extra")
+        assert self.config.sections() == ["db", "log"]
@@ -0,0 +1,123 @@
+"""Test for Lazy extension."""
+import gzip
+
+from os import path, mkdir
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from io import StringIO
+from configparser import ParsingError
+
+from extendparser.get import Get
+from extendparser.include import Include
+from extendparser.lazy import Lazy
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=too-many-ancestors
+
+
+class Parser(Get, Lazy):
+    """Lazy parser with Get extension."""
+
+
+class TestLazy(TestCase):
+    """Test lazy loading of sections."""
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        self.main = path.join(self.tmp.name, "main.ini")
+        self.include = path.join(self.tmp.name, "include.ini")
+        with open(self.main, "w", encoding="utf-8") as file_:
+            file_.write("# main\n[DEFAULT]\nlevel = 1\n\n"
+                        "[first]\nkey = 1\n  next\n"
+                        "[second]\nkey = 2\n"
+                        ".include %s\n"
+                        "[first]\nother = 3\n" % self.include)
+        with open(self.include, "w", encoding="utf-8") as file_:
+            file_.write("[second]\nkey = 22\n[third]\nkey = 3\n")
+        self.cfp = Parser()
+        self.cfp.read_lazy(self.main)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_index(self):
+        assert self.cfp.sections() == ["first", "second", "third"]
+        assert self.cfp.pending_sections() == ["first", "second", "third"]
+        assert self.cfp.defaults() == {"level": "1"}
+        assert self.cfp.include_graph.order == [self.main, self.include]
+
+    def test_get(self):
+        assert self.cfp.get("first", "key") == "1\nnext"
+        assert self.cfp.get("first", "other") == "3"
+        assert self.cfp.pending_sections() == ["second", "third"]
+        assert self.cfp.get_option("second", "key", target=int) == 22
+        assert self.cfp.get_section("third", (("key", int), )) == \
+            {"key": 3}
+        assert self.cfp.pending_sections() == []
+
+    def test_header(self):
+        with open(self.main, "a", encoding="utf-8") as file_:
+            file_.write("[b] ; note\ny = 1\n[c]]  \nz = 2\n")
+        cfp = Parser()
+        cfp.read_lazy(self.main)
+        assert cfp.sections() == ["first", "second", "third", "b", "c]"]
+        assert cfp.get("b", "y") == "1"
+        assert cfp.get("c]", "z") == "2"
+
+    def test_error(self):
+        with open(self.main, "w", encoding="utf-8") as file_:
+            file_.write("[a]\nk = 1\n\n[b]\nk = 2\nbad line\n")
+        with self.assertRaises(ParsingError) as err:
+            Include().read(self.main)
+        assert err.exception.errors[0][0] == 6
+        cfp = Parser()
+        cfp.read_lazy(self.main)
+        assert cfp.get("a", "k") == "1"
+        for _ in range(2):
+            with self.assertRaises(ParsingError) as err:
+                cfp.get("b", "k")
+            assert err.exception.source == self.main
+            assert err.exception.errors[0][0] == 6
+
+    def test_set(self):
+        self.cfp.set("second", "key", "5")
+        assert self.cfp.get("second", "key") == "5"
+        assert self.cfp.options("third") == ["key", "level"]
+
+    def test_read(self):
+        self.cfp.read_string("[third]\nkey = 4\n")
+        assert self.cfp.pending_sections() == []
+        assert self.cfp.get("third", "key") == "4"
+
+    def test_write(self):
+        output = StringIO()
+        self.cfp.write(output)
+        assert "other = 3" in output.getvalue()
+
+    def test_directory(self):
+        conf = path.join(self.tmp.name, "conf.d")
+        mkdir(conf)
+        for name, section in (("b.ini", "second"), ("a.ini", "fourth")):
+            with open(path.join(conf, name), "w", encoding="utf-8") as file_:
+                file_.write("[%s]\nkey = %s\n" % (section, name))
+        with open(self.main, "a", encoding="utf-8") as file_:
+            file_.write(".include %s\n" % conf)
+        cfp = Parser()
+        cfp.read_lazy(self.main)
+        assert cfp.sections() == ["first", "second", "third", "fourth"]
+        assert cfp.get("second", "key") == "b.ini"
+        assert cfp.include_graph.directories == [conf]
+
+    def test_compressed(self):
+        compressed = path.join(self.tmp.name, "compressed.ini.gz")
+        with gzip.open(compressed, "wt", encoding="utf-8") as file_:
+            file_.write("[fourth]\nkey = 4\n")
+        with open(self.main, "a", encoding="utf-8") as file_:
+            file_.write(".include %s\n[fifth]\nkey = 5\n" % compressed)
+        cfp = Parser()
+        cfp.read_lazy(self.main)
+        assert cfp.get("fourth", "key") == "4"
+        assert cfp.pending_sections() == ["fifth"]
+        assert cfp.get("first", "other") == "3"
+        assert cfp.include_graph.order == [self.main, self.include,
+                                           compressed]
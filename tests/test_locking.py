@@ -0,0 +1,114 @@
+"""Test for reader-writer locking."""
+from threading import Thread, Event
+from unittest import TestCase
+
+from extendparser import ExtendParser
+from extendparser.locking import RWLock, Concurrent
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=too-many-ancestors
+
+
+class Parser(Concurrent, ExtendParser):
+    """Concurrent ExtendParser."""
+
+
+def start(target):
+    thread = Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestRWLock(TestCase):
+    """Test RWLock."""
+
+    def setUp(self):
+        self.lock = RWLock()
+
+    def test_readers(self):
+        entered = Event()
+
+        def reader():
+            with self.lock.read_locked():
+                entered.set()
+
+        with self.lock.read_locked():
+            thread = start(reader)
+            assert entered.wait(1)
+            thread.join(1)
+
+    def test_writer(self):
+        released = Event()
+        done = []
+
+        def writer():
+            with self.lock.write_locked():
+                done.append(released.is_set())
+
+        with self.lock.read_locked():
+            thread = start(writer)
+            thread.join(0.05)
+            assert thread.is_alive()
+            released.set()
+        thread.join(1)
+        assert done == [True]
+
+    def test_reentrant(self):
+        with self.lock.write_locked():
+            with self.lock.write_locked():
+                with self.lock.read_locked():
+                    pass
+        with self.lock.read_locked():
+            with self.lock.read_locked():
+                with self.assertRaises(RuntimeError):
+                    self.lock.acquire_write()
+        with self.lock.write_locked():      # all is released
+            pass
+
+    def test_downgrade(self):
+        self.lock.acquire_write()
+        self.lock.acquire_read()
+        self.lock.release_write()
+        thread = start(self.lock.acquire_write)
+        thread.join(0.05)
+        assert thread.is_alive()
+        self.lock.release_read()
+        thread.join(1)
+        assert not thread.is_alive()
+
+
+class TestConcurrent(TestCase):
+    """Test parser with locking."""
+
+    def test_methods(self):
+        cfp = Parser(defaults={"level": "1"})
+        cfp.read_string("[main]\nport = 80\n")
+        cfp["other"] = {"key": "value"}
+        assert cfp.get_option("main", "port", target=int) == 80
+        assert cfp.get_section("other", ("key", )) == {"key": "value"}
+        assert "other" in cfp
+        del cfp["other"]
+        assert cfp.sections() == ["main"]
+        assert cfp.freeze().get("main", "level") == "1"
+
+    def test_atomic_read(self):
+        cfp = Parser()
+        cfp.read_string("[main]\nkey = old\n")
+        reading, proceed = Event(), Event()
+        values = []
+
+        def lines():
+            yield "[main]\n"
+            reading.set()
+            proceed.wait(1)
+            yield "key = new\n"
+
+        writer = start(lambda: cfp.read_file(lines(), "<lines>"))
+        assert reading.wait(1)
+        reader = start(lambda: values.append(cfp.get("main", "key")))
+        reader.join(0.05)
+        assert reader.is_alive()
+        proceed.set()
+        writer.join(1)
+        reader.join(1)
+        assert values == ["new"]
@@ -0,0 +1,100 @@
+"""Test for shared configuration."""
+from configparser import NoOptionError, NoSectionError
+from os import path
+from subprocess import run
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import sys
+
+from extendparser import ExtendParser
+from extendparser.shared import SharedConfig, encode, publish
+
+# pylint: disable=missing-function-docstring
+
+
+class TestShared(TestCase):
+    """Test reading values from buffer."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cfp = ExtendParser(defaults={"host": "localhost"},
+                               allow_no_value=True)
+        cls.cfp.read_string("[server]\nport = 8080\nurl = http://%(host)s/\n"
+                            "debug = on\nflag\n"
+                            "[server b]\nport = 8081\n"
+                            "[empty]\n"
+                            "[unicode]\nname = Tůma\n")
+        cls.config = SharedConfig(encode(cls.cfp))
+
+    def test_get(self):
+        assert self.config.get("server", "url") == "http://localhost/"
+        assert self.config.get("server", "HOST") == "localhost"
+        assert self.config.get("server b", "port") == "8081"
+        assert self.config.get("DEFAULT", "host") == "localhost"
+        assert self.config.get("unicode", "name") == "Tůma"
+        assert self.config.get("server", "flag") is None
+        assert self.config.getint("server", "port") == 8080
+        assert self.config.getboolean("server", "debug") is True
+
+    def test_not_found(self):
+        with self.assertRaises(NoSectionError):
+            self.config.get("none", "port")
+        with self.assertRaises(NoOptionError):
+            self.config.get("empty", "port")
+        assert self.config.get("empty", "port", fallback=1) == 1
+
+    def test_get_section(self):
+        assert self.config.get_section(
+            "server", (("port", int), ("debug", bool))) == \
+            {"port": 8080, "debug": True}
+
+    def test_sections(self):
+        assert self.config.sections() == ["empty", "server", "server b",
+                                          "unicode"]
+        assert self.config.has_section("empty")
+        assert not self.config.has_section("DEFAULT")
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SharedConfig(b"invalid buffer")
+        with self.assertRaises(ValueError):
+            SharedConfig(b"")
+
+    def test_shared_memory(self):
+        memory = publish(self.cfp)
+        try:
+            config = SharedConfig.attach(memory.name)
+            assert config.getint("server", "port") == 8080
+            config.close()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_attach_process(self):
+        memory = publish(self.cfp)
+        try:
+            code = ("from extendparser.shared import SharedConfig\n"
+                    "config = SharedConfig.attach(%r)\n"
+                    "print(config.get('server', 'port'))\n"
+                    "config.close()\n" % memory.name)
+            for _ in range(2):
+                process = run([sys.executable, "-c", code], check=True,
+                              capture_output=True, text=True)
+                assert process.stdout == "8080\n"
+                assert process.stderr == ""
+            config = SharedConfig.attach(memory.name)
+            assert config.getint("server", "port") == 8080
+            config.close()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_file(self):
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, "config.bin")
+            with open(filename, "wb") as file_:
+                file_.write(encode(self.cfp))
+            config = SharedConfig.from_file(filename)
+            assert config.getint("server b", "port") == 8081
+            config.close()
@@ -0,0 +1,116 @@
+"""Test for instrumentation."""
+from os import environ, path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from extendparser import ExtendParser
+from extendparser.environ import EnvironFirst, EnvironLast
+from extendparser.stats import Instrument
+
+# pylint: disable=missing-function-docstring
+
+
+class TestInstrument(TestCase):
+    """Test Instrument counters and hooks."""
+
+    def setUp(self):
+        self.cfp = ExtendParser()
+        self.cfp.read_dict({"test": {"number": "42"}})
+        self.cfp.instrument = Instrument()
+
+    def test_disabled(self):
+        cfp = ExtendParser()
+        assert cfp.stats() is None
+        assert cfp.get_option("test", "x", fallback=1) == 1
+
+    def test_counters(self):
+        self.cfp.get_option("test", "number", target=int)
+        self.cfp.get_option("test", "number", target=int)
+        self.cfp.get_option("test", "other", fallback=None)
+        with self.assertRaises(Exception):
+            self.cfp.get_option("test", "missing")
+        stats = self.cfp.stats()
+        assert stats["lookups"] == {("test", "number"): 2,
+                                    ("test", "other"): 1,
+                                    ("test", "missing"): 1}
+        assert stats["fallbacks"] == {("test", "other"): 1}
+        assert stats["missing"] == {("test", "missing"): 1}
+
+    def test_cached(self):
+        self.cfp.cache_options = True
+        self.cfp.get_option("test", "number", target=int)
+        self.cfp.get_option("test", "number", target=int)
+        assert self.cfp.stats()["lookups"] == {("test", "number"): 2}
+
+    def test_section(self):
+        self.cfp.get_section("test", ("number", ("other", int, 0)))
+        assert self.cfp.stats()["fallbacks"] == {("test", "other"): 1}
+
+    def test_hooks(self):
+        events = []
+
+        def hook(*args):
+            events.append(args)
+
+        def broken(*args):
+            raise RuntimeError(args)
+
+        self.cfp.instrument.add_hook(broken)
+        self.cfp.instrument.add_hook(hook)
+        with self.assertLogs("extendparser", "ERROR"):
+            self.cfp.get_option("test", "other", fallback=None)
+        assert events == [("lookup", ("test", "other"), 1),
+                          ("fallback", ("test", "other"), 1)]
+        self.cfp.instrument.remove_hook(hook)
+        self.cfp.instrument.remove_hook(broken)
+        self.cfp.get_option("test", "other", fallback=None)
+        assert len(events) == 2
+
+    def test_reset(self):
+        self.cfp.get_option("test", "number")
+        self.cfp.instrument.reset()
+        assert self.cfp.stats()["lookups"] == {}
+
+    def test_file_times(self):
+        events = []
+        self.cfp.instrument.add_hook(lambda *args: events.append(args))
+        with TemporaryDirectory() as tmp:
+            main = path.join(tmp, "main.ini")
+            include = path.join(tmp, "include.ini")
+            with open(main, "w", encoding="utf-8") as main_file:
+                main_file.write("[main]\n.include %s\n" % include)
+            with open(include, "w", encoding="utf-8") as include_file:
+                include_file.write("[include]\nkey = value\n")
+            self.cfp.read(main)
+            self.cfp.read(main)
+        stats = self.cfp.stats()
+        assert stats["reads"] == 2
+        assert set(stats["file_times"]) == {main, include}
+        assert sorted(event[1] for event in events) == \
+            sorted([main, include] * 2)
+
+
+class TestEnviron(TestCase):
+    """Test counting of environment hits."""
+
+    def setUp(self):
+        environ["STATS_ENV"] = "env"
+        environ["STATS_BOTH"] = "env"
+
+    def tearDown(self):
+        del environ["STATS_ENV"]
+        del environ["STATS_BOTH"]
+
+    def check(self, cls, expected):
+        cfp = cls()
+        cfp.read_dict({"stats": {"both": "config", "config": "config"}})
+        cfp.instrument = Instrument()
+        for option in ("env", "both", "config"):
+            cfp.get("stats", option)
+        assert cfp.instrument.environ_hits == expected
+
+    def test_environ_first(self):
+        self.check(EnvironFirst, {("stats", "env"): 1, ("stats", "both"): 1})
+
+    def test_environ_last(self):
+        self.check(EnvironLast, {("stats", "env"): 1})
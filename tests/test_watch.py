@@ -0,0 +1,107 @@
+"""Test for Watcher."""
+from os import path, mkdir, remove, utime
+from tempfile import TemporaryDirectory
+from time import sleep
+from unittest import TestCase
+
+from extendparser import ExtendParser
+from extendparser.watch import Watcher
+
+# pylint: disable=missing-function-docstring
+
+
+def write(filename, content):
+    """Write content to file."""
+    with open(filename, "w", encoding="utf-8") as file_:
+        file_.write(content)
+
+
+class TestWatcher(TestCase):
+    """Test reloading of changed files."""
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        self.main = path.join(self.tmp.name, "main.ini")
+        self.include = path.join(self.tmp.name, "include.ini")
+        write(self.main, "[main]\nkey = value\n.include %s\n" % self.include)
+        write(self.include, "[sec]\nkey = 1\nfoo = bar\n")
+        self.watcher = Watcher(ExtendParser, self.main, interval=0.01)
+        self.changes = []
+        self.watcher.subscribe(
+            lambda parser, changed: self.changes.append(changed))
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmp.cleanup()
+
+    def test_unchanged(self):
+        assert self.watcher.check() == set()
+        assert not self.changes
+
+    def test_changed(self):
+        parser = self.watcher.parser
+        write(self.include, "[sec]\nkey = 22\n[new]\nkey = 3\n")
+        assert self.watcher.changed_files() == [self.include]
+        assert self.watcher.check() == {
+            ("sec", "key"), ("sec", "foo"), ("new", "key")}
+        assert self.changes == [{
+            ("sec", "key"), ("sec", "foo"), ("new", "key")}]
+        assert self.watcher.parser is not parser
+        assert self.watcher.parser.get("sec", "key") == "22"
+        assert self.watcher.fragment_cache.hits == 1
+
+    def test_thread(self):
+        self.watcher.start()
+        write(self.include, "[sec]\nkey = 22\nfoo = bar\n")
+        for _ in range(100):
+            if self.changes:
+                break
+            sleep(0.01)
+        assert self.changes == [{("sec", "key")}]
+
+
+class TestSources(TestCase):
+    """Test reloading with sources tracking."""
+
+    def test_notifier(self):
+        class Parser(ExtendParser):
+            """Parser with sources tracking."""
+            track_sources = True
+
+        with TemporaryDirectory() as tmp:
+            main = path.join(tmp, "main.ini")
+            include = path.join(tmp, "include.ini")
+            write(main, "[main]\nkey = value\n.include %s\n" % include)
+            write(include, "[sec]\nkey = 1\n")
+            watcher = Watcher(Parser, main)
+            deltas = []
+            watcher.notifier.subscribe(deltas.append, "sec")
+            watcher.notifier.subscribe(deltas.append, "main")
+
+            write(include, "[sec]\nkey = 22\n")
+            assert watcher.check() == {("sec", "key")}
+            assert len(deltas) == 1
+            assert deltas[0].changed == {("sec", "key"): ("1", "22")}
+            assert deltas[0].sources == {("sec", "key"): (include, 2, 2)}
+
+    def test_directory(self):
+        class Parser(ExtendParser):
+            """Parser with sources tracking."""
+            track_sources = True
+
+        with TemporaryDirectory() as tmp:
+            main = path.join(tmp, "main.ini")
+            conf = path.join(tmp, "conf.d")
+            mkdir(conf)
+            write(main, "[main]\nkey = value\n.include %s/*.ini\n" % conf)
+            write(path.join(conf, "a.ini"), "[a]\nkey = 1\n")
+            watcher = Watcher(Parser, main)
+
+            utime(conf, ns=(0, 0))      # mtime could be the same in test
+            write(path.join(conf, "b.ini"), "[b]\nkey = 2\n")
+            assert watcher.changed_files() == [conf]
+            assert watcher.check() == {("b", "key")}
+
+            remove(path.join(conf, "a.ini"))
+            assert watcher.check() == {("a", "key")}
+            assert watcher.parser.sections() == ["main", "b"]
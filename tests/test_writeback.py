@@ -0,0 +1,161 @@
+"""Test for writing changes back to source files."""
+import gzip
+
+from os import path, chmod, listdir, stat
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from extendparser import ExtendParser
+from extendparser.writeback import write_back, pending_changes, \
+    SourceChangedError
+
+# pylint: disable=missing-function-docstring
+
+
+class Parser(ExtendParser):
+    """Parser with sources tracking."""
+    track_sources = True
+
+
+class TestWriteBack(TestCase):
+    """Test write_back function."""
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()   # pylint: disable=R1732
+        self.main = path.join(self.tmp.name, "main.ini")
+        self.include = path.join(self.tmp.name, "include.ini")
+        self.write(self.main, "# main\n[main]\nKey: value\n  next line\n"
+                   ".include %s\n\n[sec]\nfoo = bar\n" % self.include)
+        self.write(self.include, "[inc]\n; comment\nkey = a\nother = b\n\n"
+                   "[gone]\nkey = c\n")
+        self.cfp = Parser()
+        self.cfp.read(self.main)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def write(filename, content):
+        with open(filename, "w", encoding="utf-8") as file_:
+            file_.write(content)
+
+    @staticmethod
+    def content(filename):
+        with open(filename, encoding="utf-8") as file_:
+            return file_.read()
+
+    def reread(self):
+        cfp = Parser()
+        cfp.read(self.main)
+        return cfp
+
+    def test_unchanged(self):
+        assert pending_changes(self.cfp) == {}
+        assert write_back(self.cfp) == []
+
+    def test_changed(self):
+        self.cfp.set("inc", "key", "changed")
+        assert pending_changes(self.cfp) == {("inc", "key"): ("a", "changed")}
+        assert write_back(self.cfp) == [self.include]
+        assert self.content(self.include) == (
+            "[inc]\n; comment\nkey = changed\nother = b\n\n"
+            "[gone]\nkey = c\n")
+        assert write_back(self.cfp) == []
+
+    def test_multiline(self):
+        self.cfp.set("main", "key", "one\ntwo")
+        assert write_back(self.cfp) == [self.main]
+        assert self.content(self.main) == (
+            "# main\n[main]\nKey : one\n\ttwo\n"
+            ".include %s\n\n[sec]\nfoo = bar\n" % self.include)
+        assert self.reread().get("main", "key") == "one\ntwo"
+
+    def test_add_remove(self):
+        self.cfp.remove_option("inc", "key")
+        self.cfp.set("inc", "new", "1")
+        self.cfp.remove_section("gone")
+        self.cfp["added"] = {"x": "y"}
+        self.cfp.add_section("empty")
+        assert sorted(write_back(self.cfp)) == sorted(
+            [self.main, self.include])
+        assert self.content(self.include) == \
+            "[inc]\n; comment\nother = b\nnew = 1\n\n"
+        assert self.content(self.main).endswith(
+            "[sec]\nfoo = bar\n\n[added]\nx = y\n\n[empty]\n")
+        cfp = self.reread()
+        assert cfp.sections() == ["main", "inc", "sec", "added", "empty"]
+        assert dict(cfp["inc"]) == {"other": "b", "new": "1"}
+
+    def test_add_at_end(self):
+        self.write(self.main, "[main]\nkey = value\n.include %s\n[main]\n"
+                   "last = 1\n" % self.include)
+        cfp = self.reread()
+        cfp.set("main", "new", "n")
+        cfp.add_section("fresh")
+        cfp.set("fresh", "a", "b")
+        assert write_back(cfp) == [self.main]
+        assert self.content(self.main) == (
+            "[main]\nkey = value\n.include %s\n[main]\nlast = 1\nnew = n\n"
+            "\n[fresh]\na = b\n" % self.include)
+        cfp = self.reread()
+        assert cfp.get("main", "new") == "n"
+        assert dict(cfp["fresh"]) == {"a": "b"}
+
+    def test_remove_all(self):
+        self.write(self.main, "[inc]\nhost = a\n.include %s\n[inc]\n"
+                   "host = c\n" % self.include)
+        self.write(self.include, "[inc]\nhost = b\nkey = 1\n")
+        cfp = self.reread()
+        cfp.set("inc", "host", "d")
+        write_back(cfp)
+        assert self.content(self.main) == (
+            "[inc]\nhost = a\n.include %s\n[inc]\nhost = d\n"
+            % self.include)
+        cfp.remove_option("inc", "host")
+        assert sorted(write_back(cfp)) == sorted([self.main, self.include])
+        assert not self.reread().has_option("inc", "host")
+        assert self.content(self.include) == "[inc]\nkey = 1\n"
+        assert ("inc", "host") not in cfp.option_sources
+
+    def test_sources_updated(self):
+        self.cfp.set("inc", "before", "0")
+        self.cfp.remove_option("inc", "key")
+        write_back(self.cfp)
+        assert self.cfp.option_sources[("inc", "other")] == \
+            [(self.include, 3, 3)]
+        self.cfp.set("inc", "other", "bb")
+        write_back(self.cfp)
+        assert self.reread().get("inc", "other") == "bb"
+        assert self.reread().get("inc", "before") == "0"
+
+    def test_source_changed(self):
+        self.cfp.set("inc", "key", "changed")
+        self.write(self.include, "[inc]\nkey = other file\n")
+        with self.assertRaises(SourceChangedError):
+            write_back(self.cfp)
+
+    def test_stream(self):
+        cfp = Parser()
+        cfp.include_stream = True
+        cfp.read(self.main)
+        cfp.set("sec", "foo", "baz")
+        assert write_back(cfp) == [self.main]
+        assert self.reread().get("sec", "foo") == "baz"
+
+    def test_tmp_file(self):
+        chmod(self.include, 0o600)
+        self.cfp.set("inc", "key", "changed")
+        assert write_back(self.cfp) == [self.include]
+        assert stat(self.include).st_mode & 0o777 == 0o600
+        assert sorted(listdir(self.tmp.name)) == ["include.ini", "main.ini"]
+
+    def test_compressed(self):
+        compressed = path.join(self.tmp.name, "main.ini.gz")
+        with gzip.open(compressed, "wt", encoding="utf-8") as file_:
+            file_.write("[main]\nkey = value\n")
+        cfp = Parser()
+        cfp.read(compressed)
+        cfp.set("main", "key", "new")
+        assert write_back(cfp) == [compressed]
+        with gzip.open(compressed, "rt", encoding="utf-8") as file_:
+            assert file_.read() == "[main]\nkey = new\n"